@@ -10,6 +10,17 @@ from scripts.db import create_table, create_user_table
 create_table()        # tickets table
 create_user_table()   # users table
 
+# =====================================
+# MODEL WARM-UP (BACKGROUND, ONCE PER PROCESS)
+# =====================================
+from scripts.ai_logic import warm_up
+from scripts.metrics import start_textfile_exporter
+
+warm_up()   # models + NLTK load off the render path
+
+# Latency histograms -> $TICKET_METRICS_FILE for a local collector
+start_textfile_exporter()
+
 # =====================================
 # PAGE CONFIG
 # =====================================
@@ -55,6 +66,10 @@ if st.sidebar.button("📂 Active Tickets", use_container_width=True):
 if st.sidebar.button("🗄 Closed Tickets", use_container_width=True):
     st.switch_page("pages/closed_tickets.py")
 
+if st.session_state.get("role") == "admin":
+    if st.sidebar.button("⏱ Latency Metrics", use_container_width=True):
+        st.switch_page("pages/metrics.py")
+
 st.sidebar.divider()
 
 if st.sidebar.button("🔐 Login", use_container_width=True):
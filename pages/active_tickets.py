@@ -1,9 +1,15 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
-import json
 
-from scripts.db import fetch_active_tickets, update_status
+from scripts.db import (
+    count_tickets,
+    fetch_filter_options,
+    fetch_ticket_ids,
+    fetch_tickets_page,
+    update_status,
+    update_status_many,
+)
+from scripts.search_ui import render_search
 
 # =====================================
 # PAGE CONFIG
@@ -25,20 +31,85 @@ st.markdown(
     "Monitor ongoing support tickets, track SLA, update status, and inspect ticket JSON."
 )
 
+# =====================================
+# FULL-TEXT SEARCH (BEST MATCHES FIRST)
+# =====================================
+render_search("active")
+
 # =====================================
 # DEVELOPER MODE (JSON VISIBILITY)
 # =====================================
 show_json = st.toggle("👩‍💻 Developer Mode (Show Ticket JSON)", value=False)
 
 # =====================================
-# FETCH DATA
+# FILTERS, SORT & PAGE SIZE (RUN IN SQL)
+# =====================================
+STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+
+SLA_OPTIONS = {
+    "All": None,
+    "Within SLA (< 2 hrs)": "within",
+    "Approaching SLA (2–6 hrs)": "approaching",
+    "SLA Breached (> 6 hrs)": "breached",
+}
+
+SORT_OPTIONS = {
+    "Newest first": "newest",
+    "Oldest first": "oldest",
+    "Priority (High → Low)": "priority",
+}
+
+COLUMNS = [
+    "id", "title", "description", "category",
+    "priority", "status", "created_at", "updated_at", "age_hours"
+]
+
+options = fetch_filter_options("active")
+
+f1, f2, f3, f4, f5, f6 = st.columns(6)
+
+category = f1.selectbox("Category", ["All"] + options["category"])
+priority = f2.selectbox("Priority", ["All"] + options["priority"])
+status_filter = f3.selectbox("Status", ["All"] + options["status"])
+sla = SLA_OPTIONS[f4.selectbox("SLA", list(SLA_OPTIONS))]
+sort = SORT_OPTIONS[f5.selectbox("Sort by", list(SORT_OPTIONS))]
+page_size = f6.selectbox("Page size", [10, 20, 50, 100], index=1)
+
+filters = {
+    "category": None if category == "All" else category,
+    "priority": None if priority == "All" else priority,
+    "status": None if status_filter == "All" else status_filter,
+    "sla": sla,
+}
+
+# Keyset cursors for the pages visited so far; reset when the query changes
+query_key = (tuple(filters.items()), sort, page_size)
+
+if st.session_state.get("active_query") != query_key:
+    st.session_state.active_query = query_key
+    st.session_state.active_cursors = [None]
+
+cursors = st.session_state.active_cursors
+page_no = len(cursors)
+
+# =====================================
+# FETCH DATA (CURRENT PAGE ONLY)
 # =====================================
-tickets = fetch_active_tickets()
+total = count_tickets("active", **filters)
 
-if not tickets:
+if not total:
     st.info("No active tickets available.")
     st.stop()
 
+tickets, next_cursor = fetch_tickets_page(
+    "active",
+    columns=COLUMNS,
+    limit=page_size,
+    after=cursors[-1],
+    sort=sort,
+    **filters
+)
+
 # =====================================
 # TABLE VIEW (SUMMARY)
 # =====================================
@@ -47,26 +118,76 @@ df = pd.DataFrame(
     columns=[
         "ID", "Title", "Description",
         "Category", "Priority", "Status",
-        "Created", "Updated"
+        "Created", "Updated", "Age (hrs)"
     ]
 )
 
 st.subheader("📋 Active Ticket Summary")
 
+st.caption(
+    f"Page {page_no} of {-(-total // page_size)} · {total} matching tickets"
+)
+
 st.dataframe(
     df[["ID", "Description", "Category", "Priority", "Status", "Created"]],
     use_container_width=True
 )
 
+# =====================================
+# PAGINATION
+# =====================================
+p1, p2, _ = st.columns([1, 1, 6])
+
+if p1.button("⬅️ Previous", disabled=page_no == 1):
+    cursors.pop()
+    st.rerun()
+
+if p2.button("Next ➡️", disabled=next_cursor is None):
+    cursors.append(next_cursor)
+    st.rerun()
+
+# =====================================
+# BULK STATUS UPDATE (ONE TRANSACTION)
+# =====================================
+with st.expander("🗂 Bulk Status Update"):
+    scope = st.radio(
+        "Apply to",
+        ["Selected tickets on this page", f"All {total} matching tickets"],
+        horizontal=True
+    )
+
+    if scope.startswith("Selected"):
+        selected_ids = st.multiselect(
+            "Tickets",
+            [t[0] for t in tickets],
+            format_func=lambda tid: f"#{tid}"
+        )
+    else:
+        selected_ids = None
+
+    bulk_status = st.selectbox("New status", STATUSES, key="bulk_status")
+
+    if st.button("💾 Apply to Tickets", key="bulk_save"):
+        if selected_ids is None:
+            selected_ids = fetch_ticket_ids("active", **filters)
+
+        if not selected_ids:
+            st.warning("Select at least one ticket.")
+        else:
+            updated = update_status_many(selected_ids, bulk_status)
+            st.session_state.active_cursors = [None]
+            st.success(f"✅ {updated} tickets updated")
+            st.rerun()
+
 st.divider()
 
 # =====================================
 # DETAILED TICKET VIEW
 # =====================================
 for t in tickets:
-    tid, title, desc, cat, pr, status, created_at, updated_at = t
+    tid, title, desc, cat, pr, status, created_at, updated_at, hours = t
 
-    with st.expander(f"🎫 Ticket #{tid} — {pr.upper()}"):
+    with st.expander(f"🎫 Ticket #{tid} — {(pr or '').upper()}"):
 
         # -------------------------
         # Ticket Description
@@ -77,10 +198,9 @@ for t in tickets:
         # -------------------------
         # SLA TIMER
         # -------------------------
-        created = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
-        hours = (datetime.now() - created).total_seconds() / 3600
-
-        if hours < 2:
+        if hours is None:
+            st.info("⏱️ Created time unknown — SLA not tracked")
+        elif hours < 2:
             st.success(f"⏱️ {hours:.1f} hrs — Within SLA")
         elif hours < 6:
             st.warning(f"⏱️ {hours:.1f} hrs — Approaching SLA")
@@ -92,8 +212,8 @@ for t in tickets:
         # -------------------------
         new_status = st.selectbox(
             "📌 Update Status",
-            ["Open", "In Progress", "Resolved", "Closed"],
-            index=["Open", "In Progress", "Resolved", "Closed"].index(status),
+            STATUSES,
+            index=STATUSES.index(status) if status in STATUSES else 0,
             key=f"status_{tid}"
         )
 
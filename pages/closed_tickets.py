@@ -1,5 +1,6 @@
 import streamlit as st
 from scripts.db import fetch_closed_tickets
+from scripts.search_ui import render_search
 
 st.set_page_config(page_title="Closed Tickets", layout="wide")
 
@@ -8,6 +9,8 @@ if not st.session_state.get("logged_in"):
 
 st.title("🗄 Closed Tickets")
 
+render_search("closed")
+
 tickets = fetch_closed_tickets()
 
 if not tickets:
@@ -1,7 +1,16 @@
+import os
+
 import streamlit as st
-from scripts.db import insert_ticket
+from scripts.db import PENDING, get_ticket_classification, insert_ticket
 from scripts.ai_logic import predict_ticket
 
+# =====================================
+# CLASSIFICATION MODE
+# =====================================
+# TICKET_ASYNC_CLASSIFICATION=1 saves the ticket at once as "Pending" and
+# classifies it on a background worker pool (scripts/classification_queue.py)
+ASYNC_CLASSIFICATION = os.environ.get("TICKET_ASYNC_CLASSIFICATION") == "1"
+
 st.set_page_config(page_title="Create Ticket", layout="centered")
 
 if not st.session_state.get("logged_in"):
@@ -17,6 +26,12 @@ user_input = st.text_area(
 if st.button("Generate & Save Ticket"):
     if not user_input.strip():
         st.warning("Please enter issue description.")
+    elif ASYNC_CLASSIFICATION:
+        from scripts.classification_queue import create_ticket_async
+
+        ticket_id, _ = create_ticket_async(user_input)
+        st.session_state.pending_ticket_id = ticket_id
+        st.session_state.pending_result = None
     else:
         category, priority = predict_ticket(user_input)
 
@@ -29,3 +44,60 @@ if st.button("Generate & Save Ticket"):
 
         st.success("🎫 Ticket created successfully")
         st.switch_page("pages/dashboard.py")
+
+
+# =====================================
+# CLASSIFICATION STATUS (ASYNC MODE)
+# =====================================
+# The fragment polls until the ticket is classified or its worker gave
+# up, stores the outcome in pending_result and reruns the page, which
+# then renders the outcome without the fragment (polling stops).
+@st.fragment(run_every="1s")
+def classification_status(ticket_id):
+    from scripts.classification_queue import get_queue
+
+    row = get_ticket_classification(ticket_id)
+    status = get_queue().status(ticket_id)
+    failed = status == "failed"
+
+    # A worker writes the categories before it marks the ticket finished
+    if row is not None and status not in ("queued", "processing") and (
+        row[0] != PENDING or failed
+    ):
+        st.session_state.pending_result = (*row, failed)
+        st.rerun()
+
+    st.info(f"🎫 Ticket #{ticket_id} saved — AI classification in progress…")
+
+
+def show_result(ticket_id, category, priority, failed):
+    if category == PENDING:
+        st.error(
+            f"🎫 Ticket #{ticket_id} saved, but AI classification failed — "
+            "it will be retried when the app restarts"
+        )
+    elif failed:
+        st.warning(
+            f"🎫 Ticket #{ticket_id} created — AI classification failed, "
+            f"defaulted to Category: `{category}` | Priority: `{priority}`"
+        )
+    else:
+        st.success(
+            f"🎫 Ticket #{ticket_id} created — Category: `{category}` | "
+            f"Priority: `{priority}`"
+        )
+
+
+if st.session_state.get("pending_ticket_id"):
+    ticket_id = st.session_state.pending_ticket_id
+    result = st.session_state.get("pending_result")
+
+    if result is None:
+        classification_status(ticket_id)
+    else:
+        show_result(ticket_id, *result)
+
+    if st.button("🏠 Go to Dashboard"):
+        st.session_state.pending_ticket_id = None
+        st.session_state.pending_result = None
+        st.switch_page("pages/dashboard.py")
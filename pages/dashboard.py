@@ -1,4 +1,6 @@
 import streamlit as st
+import pandas as pd
+from scripts.cache import read_cache
 from scripts.db import get_counts
 
 # =====================================
@@ -72,3 +74,24 @@ elif stats["open"] > 0:
     st.info("📌 Ticket load is manageable.")
 else:
     st.success("🎉 No open tickets — system is clear!")
+
+# =====================================
+# DEVELOPER PANEL (READ CACHE STATS)
+# =====================================
+st.divider()
+
+if st.toggle("👩‍💻 Developer Mode (Cache Stats)", value=False):
+    cache_stats = read_cache.stats()
+
+    if cache_stats:
+        st.dataframe(
+            pd.DataFrame.from_dict(cache_stats, orient="index"),
+            use_container_width=True
+        )
+    else:
+        st.info("No cached reads yet.")
+
+    st.caption(
+        f"Shared across sessions · TTL {read_cache.ttl}s · "
+        "invalidated on ticket writes"
+    )
@@ -0,0 +1,86 @@
+import time
+
+import streamlit as st
+import pandas as pd
+
+from scripts.metrics import metrics
+
+# =====================================
+# PAGE CONFIG
+# =====================================
+st.set_page_config(page_title="Latency Metrics", layout="wide")
+
+# =====================================
+# AUTH CHECK (ADMIN ONLY)
+# =====================================
+if not st.session_state.get("logged_in"):
+    st.switch_page("pages/login.py")
+
+if st.session_state.get("role") != "admin":
+    st.error("⛔ Latency metrics are only available to admins.")
+    st.stop()
+
+# =====================================
+# TITLE
+# =====================================
+st.title("⏱ Latency Metrics")
+st.caption(
+    "Per-stage latency histograms for the inference pipeline and database "
+    "calls in this app process"
+)
+
+COLUMNS = ["count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+
+
+# =====================================
+# LIVE TABLES (REFRESH EVERY 2s)
+# =====================================
+@st.fragment(run_every="2s")
+def live_metrics():
+    snapshot = metrics.snapshot()
+
+    if not snapshot:
+        st.info("No calls recorded yet — create or browse some tickets.")
+        return
+
+    df = pd.DataFrame.from_dict(snapshot, orient="index")[COLUMNS]
+
+    for prefix, label in (("inference.", "🤖 Inference Stages"),
+                          ("db.", "🗄 Database Calls")):
+        part = df[df.index.str.startswith(prefix)]
+        if part.empty:
+            continue
+
+        st.subheader(label)
+        part = part.rename(index=lambda name: name[len(prefix):])
+        st.dataframe(
+            part.style.format({c: "{:.2f}" for c in COLUMNS[1:]}),
+            use_container_width=True
+        )
+        st.bar_chart(part[["p50_ms", "p95_ms", "p99_ms"]], stack=False)
+
+    st.caption(
+        f"Collecting for {time.time() - metrics.started:,.0f}s · "
+        f"updated {time.strftime('%H:%M:%S')}"
+    )
+
+
+live_metrics()
+
+st.divider()
+
+# =====================================
+# EXPORT & RESET
+# =====================================
+e1, e2, _ = st.columns([1, 1, 4])
+
+e1.download_button(
+    "📥 Export (Prometheus text)",
+    metrics.export_text(),
+    file_name="ticket_latency.prom",
+    mime="text/plain"
+)
+
+if e2.button("♻️ Reset Histograms"):
+    metrics.reset()
+    st.rerun()
@@ -1,59 +1,36 @@
-import joblib
-from pathlib import Path
-from scripts.clean_text import clean_text
+from functools import lru_cache
+from itertools import islice
+
+from scripts.inference_pipeline import (  # noqa: F401  (re-exported)
+    BASE_DIR,
+    FEATURE_MODE,
+    MODEL_FORMAT,
+    MODELS_DIR,
+    RULES,
+    ModelArtifacts,
+    get_artifacts,
+    get_pipeline,
+    warm_up,
+)
 
 
 # =====================================
-# PROJECT ROOT & MODELS DIR
+# APP ENTRY POINT (THIN WRAPPER)
 # =====================================
-BASE_DIR = Path(__file__).resolve().parents[1]
-MODELS_DIR = BASE_DIR / "models"
+# Models, keyword rules and the inference steps live in
+# scripts/inference_pipeline.py; this module keeps the app's API:
+# (category, Capitalized priority) tuples, ValueError on empty input.
 
+# Rows per pipeline run in predict_tickets (bounds peak memory)
+BATCH_SIZE = 2048
 
-# =====================================
-# LOAD MODELS (ONCE)
-# =====================================
-try:
-    vectorizer = joblib.load(MODELS_DIR / "tfidf_vectorizer.pkl")
-
-    category_model = joblib.load(MODELS_DIR / "category_model.pkl")
-    priority_model = joblib.load(MODELS_DIR / "priority_model.pkl")
-
-    category_encoder = joblib.load(MODELS_DIR / "category_encoder.pkl")
-    priority_encoder = joblib.load(MODELS_DIR / "priority_encoder.pkl")
 
-except Exception as e:
-    raise RuntimeError(f"❌ Failed to load model files:\n{e}")
-
-
-# =====================================
-# RULE-BASED CATEGORY (FAST PATH)
-# =====================================
 def rule_based_category(text: str):
-    t = text.lower()
+    return RULES.category(text)
 
-    if any(k in t for k in ["purchase", "buy", "order", "procure"]):
-        return "Purchase"
-    if any(k in t for k in ["hr", "leave", "salary"]):
-        return "HR Support"
-    if any(k in t for k in ["login", "password", "otp"]):
-        return "Access"
-    if any(k in t for k in ["vpn", "wifi", "network"]):
-        return "Network"
-    if any(k in t for k in ["laptop", "printer", "keyboard"]):
-        return "Hardware"
 
-    return None
-
-
-# =====================================
-# URGENCY DETECTION
-# =====================================
 def detect_urgent_intent(text: str) -> bool:
-    return any(
-        k in text.lower()
-        for k in ["urgent", "asap", "immediately", "critical", "system down"]
-    )
+    return RULES.is_urgent(text)
 
 
 # =====================================
@@ -63,22 +40,69 @@ def predict_ticket(text: str):
     if not isinstance(text, str) or not text.strip():
         raise ValueError("Ticket description cannot be empty")
 
-    cleaned_text = clean_text(text)
-    X = vectorizer.transform([cleaned_text])
+    return predict_tickets([text])[0]
 
-    # CATEGORY
-    rule_cat = rule_based_category(cleaned_text)
-    if rule_cat:
-        category = rule_cat
-    else:
-        cat_pred = category_model.predict(X)[0]
-        category = category_encoder.inverse_transform([cat_pred])[0]
 
-    # PRIORITY
-    pr_pred = priority_model.predict(X)[0]
-    priority = priority_encoder.inverse_transform([pr_pred])[0].capitalize()
+# =====================================
+# BATCH PREDICTION (BULK IMPORT / BACKFILL)
+# =====================================
+@lru_cache(maxsize=1)
+def _empty_text_prediction():
+    """
+    (category, priority) the models give an all-zero feature vector.
+    """
+    m = get_artifacts()
+    X = m.vectorizer.transform([""])
+    return (
+        m.category_encoder.inverse_transform(m.category_model.predict(X))[0],
+        m.priority_encoder.inverse_transform(m.priority_model.predict(X))[0],
+    )
 
-    if detect_urgent_intent(text):
-        priority = "High"
 
-    return category, priority
+def _predict_chunk(texts):
+    batch = get_pipeline().run(texts, until="urgency")
+
+    results = []
+    for text, category, priority, valid in zip(
+        texts, batch.category.tolist(), batch.priority.tolist(), batch.valid
+    ):
+        # The pipeline skips text that cleans to nothing (e.g. only stop
+        # words); the app has always run the models on it, and urgency
+        # keywords in the raw text still escalate it
+        if not valid:
+            category, priority = _empty_text_prediction()
+            if RULES.is_urgent(text):
+                priority = "high"
+        results.append((category, priority.capitalize()))
+
+    return results
+
+
+def predict_tickets(texts, batch_size: int = BATCH_SIZE):
+    """
+    Predicts (category, priority) for many ticket descriptions.
+    Accepts any iterable and processes it in chunks of batch_size,
+    so memory stays bounded; results are returned in input order.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    results = []
+    it = iter(texts)
+    offset = 0
+
+    while True:
+        chunk = list(islice(it, batch_size))
+        if not chunk:
+            break
+
+        for i, text in enumerate(chunk):
+            if not isinstance(text, str) or not text.strip():
+                raise ValueError(
+                    f"Ticket description cannot be empty (row {offset + i})"
+                )
+
+        results.extend(_predict_chunk(chunk))
+        offset += len(chunk)
+
+    return results
@@ -0,0 +1,337 @@
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+from scripts import db
+from scripts.ai_logic import get_artifacts, predict_ticket, predict_tickets
+from scripts.clean_text import clean_text, warm_up as warm_up_text_cleaning
+from scripts.synthetic_tickets import SyntheticTicketGenerator
+
+# ======================================
+# PERFORMANCE BENCHMARK SUITE
+# ======================================
+# Times the inference path (clean_text, vectorizer.transform,
+# predict_ticket, predict_tickets) and the scripts/db.py queries on a
+# synthetic corpus (scripts/synthetic_tickets.py), with the DB benchmarks
+# repeated at each table size. Every result records throughput and
+# p50/p99 latency; the run is written to benchmarks/results/ as JSON.
+# Passing --compare flags metrics that got slower than a previous run by
+# more than --threshold and exits 1.
+#
+# Usage (from the project root):
+#   python -m scripts.benchmark                        # 1k, 100k, 1M rows
+#   python -m scripts.benchmark --sizes 1000 --compare benchmarks/results/<run>.json
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+RESULTS_DIR = BASE_DIR / "benchmarks" / "results"
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+DEFAULT_THRESHOLD = 0.25     # +25% latency / -25% throughput = regression
+MIN_DELTA_MS = 0.05          # latency changes below this are timer noise
+SAMPLES = 500                # timed calls per latency benchmark
+BATCH_SIZE = 2048
+POPULATE_CHUNK = 20_000
+
+
+# ======================================
+# MEASUREMENT
+# ======================================
+def summarize(name, durations, items=None):
+    """
+    durations: seconds per call; items: work items per call (default 1).
+    """
+    d = np.asarray(durations)
+    items = len(d) if items is None else items
+    p50, p99 = np.percentile(d * 1000, [50, 99])
+    return {
+        "name": name,
+        "calls": len(d),
+        "items": items,
+        "throughput_per_s": round(items / d.sum(), 1),
+        "mean_ms": round(float(d.mean() * 1000), 4),
+        "p50_ms": round(float(p50), 4),
+        "p99_ms": round(float(p99), 4),
+    }
+
+
+def time_calls(fn, args_iter):
+    durations = []
+    for args in args_iter:
+        start = time.perf_counter()
+        fn(*args)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def report(result):
+    print(f"  {result['name']:<34} {result['throughput_per_s']:>12,.1f}/s "
+          f"p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms",
+          flush=True)
+    return result
+
+
+# ======================================
+# INFERENCE BENCHMARKS
+# ======================================
+def bench_inference(texts, samples):
+    m = get_artifacts()
+    warm_up_text_cleaning()
+    single = texts[:samples]
+
+    # One untimed pass so caches and lazy imports are warm
+    predict_tickets(texts[:BATCH_SIZE])
+
+    results = [
+        summarize("clean_text", time_calls(clean_text, ((t,) for t in single))),
+    ]
+
+    cleaned = [clean_text(t) for t in single]
+    results.append(summarize(
+        "vectorizer.transform",
+        time_calls(m.vectorizer.transform, (([c],) for c in cleaned))
+    ))
+    results.append(summarize(
+        "predict_ticket",
+        time_calls(predict_ticket, ((t,) for t in single))
+    ))
+
+    batches = [
+        texts[i:i + BATCH_SIZE] for i in range(0, len(texts), BATCH_SIZE)
+    ]
+    results.append(summarize(
+        f"predict_tickets[batch={BATCH_SIZE}]",
+        time_calls(predict_tickets, ((b,) for b in batches)),
+        items=len(texts)
+    ))
+
+    return [report(r) for r in results]
+
+
+# ======================================
+# DB BENCHMARKS
+# ======================================
+def populate(generator, size):
+    """
+    Fills the current DB with `size` synthetic tickets; returns the
+    bulk insert result.
+    """
+    rows = generator.tickets(size)
+    durations, items = [], 0
+
+    while True:
+        chunk = list(islice(rows, POPULATE_CHUNK))
+        if not chunk:
+            break
+        start = time.perf_counter()
+        db.insert_tickets_many(chunk)
+        durations.append(time.perf_counter() - start)
+        items += len(chunk)
+
+    return summarize("db.insert_tickets_many", durations, items=items)
+
+
+def bench_db(generator, size, samples, workdir):
+    db.DB_NAME = str(Path(workdir) / f"bench_{size}.db")
+    db.get_connection()
+
+    print(f"\n[db @ {size:,} tickets]", flush=True)
+    results = [populate(generator, size)]
+
+    rng = random.Random(size)
+    options = db.fetch_filter_options.uncached("active")
+    categories = options["category"] or [None]
+    new_rows = list(generator.tickets(samples, seed=size + 1))
+
+    results.append(summarize(
+        "db.insert_ticket",
+        time_calls(db.insert_ticket, (r[:4] for r in new_rows))
+    ))
+
+    fetch_page = db.fetch_tickets_page.uncached
+    results.append(summarize(
+        "db.fetch_tickets_page[first]",
+        time_calls(fetch_page, (("active",) for _ in range(samples)))
+    ))
+
+    # Walk forward with keyset cursors, as the Next button does
+    def next_pages(n):
+        after = None
+        for _ in range(n):
+            _, after = fetch_page("active", None, 50, after)
+            if after is None:
+                break
+
+    results.append(summarize(
+        "db.fetch_tickets_page[next x10]",
+        time_calls(next_pages, ((10,) for _ in range(samples // 10))),
+        items=samples // 10 * 10
+    ))
+
+    results.append(summarize(
+        "db.fetch_tickets_page[filtered]",
+        time_calls(fetch_page, (
+            ("active", None, 50, None, rng.choice(categories), None, None,
+             "breached", "priority")
+            for _ in range(samples)
+        ))
+    ))
+
+    count = db.count_tickets.uncached
+    results.append(summarize(
+        "db.count_tickets",
+        time_calls(count, (("active",) for _ in range(samples)))
+    ))
+    results.append(summarize(
+        "db.count_tickets[filtered]",
+        time_calls(count, (
+            ("active", rng.choice(categories)) for _ in range(samples)
+        ))
+    ))
+    results.append(summarize(
+        "db.get_counts",
+        time_calls(db.get_counts.uncached, (() for _ in range(samples)))
+    ))
+
+    # One or two words from ticket text, scored by BM25
+    words = [w for t in generator.texts(200) for w in t.split() if w.isalpha()]
+    results.append(summarize(
+        "db.search_tickets",
+        time_calls(db.search_tickets.uncached, (
+            (" ".join(rng.sample(words, rng.randint(1, 2))), "active")
+            for _ in range(samples)
+        ))
+    ))
+
+    ids = [rng.randint(1, size) for _ in range(samples)]
+    results.append(summarize(
+        "db.update_status",
+        time_calls(db.update_status, ((i, "In Progress") for i in ids))
+    ))
+
+    for r in results:
+        r["name"] = f"{r['name']}@{size}"
+        report(r)
+
+    db.close_connection()
+    return results
+
+
+# ======================================
+# RESULTS & REGRESSIONS
+# ======================================
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Metrics slower than the baseline by more than `threshold`.
+    """
+    before = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+
+    for r in results:
+        old = before.get(r["name"])
+        if old is None:
+            continue
+
+        checks = [
+            ("p50_ms", r["p50_ms"] / max(old["p50_ms"], 1e-9) - 1,
+             r["p50_ms"] - old["p50_ms"]),
+            ("p99_ms", r["p99_ms"] / max(old["p99_ms"], 1e-9) - 1,
+             r["p99_ms"] - old["p99_ms"]),
+            ("throughput_per_s",
+             old["throughput_per_s"] / max(r["throughput_per_s"], 1e-9) - 1,
+             r["mean_ms"] - old["mean_ms"]),
+        ]
+        for metric, change, delta_ms in checks:
+            if change > threshold and delta_ms > MIN_DELTA_MS:
+                regressions.append((r["name"], metric, old[metric], r[metric]))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+        help="ticket table sizes for the DB benchmarks"
+    )
+    parser.add_argument("--samples", type=int, default=SAMPLES)
+    parser.add_argument(
+        "--corpus", type=int, default=20_000,
+        help="synthetic texts for the inference benchmarks"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-inference", action="store_true")
+    parser.add_argument("--skip-db", action="store_true")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path, help="earlier results JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    generator = SyntheticTicketGenerator.from_splits(seed=args.seed)
+    results = []
+
+    if not args.skip_inference:
+        print(f"[inference @ {args.corpus:,} synthetic texts]", flush=True)
+        texts = list(generator.texts(args.corpus))
+        results += bench_inference(texts, args.samples)
+
+    if not args.skip_db:
+        with tempfile.TemporaryDirectory(prefix="ticket-bench-") as workdir:
+            for size in args.sizes:
+                results += bench_db(generator, size, args.samples, workdir)
+
+    run = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "samples": args.samples,
+        "results": results,
+    }
+
+    output = args.output or RESULTS_DIR / (
+        f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(run, indent=2))
+    print(f"\n✅ Results written to {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline, args.threshold)
+
+        if not regressions:
+            print(f"No regressions vs {args.compare} "
+                  f"(threshold {args.threshold:.0%})")
+            return 0
+
+        print(f"\n❌ {len(regressions)} regression(s) vs {args.compare}:")
+        for name, metric, old, new in regressions:
+            print(f"  {name:<40} {metric:<18} {old:>12,.3f} -> {new:>12,.3f}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import re
+import sys
+import time
+from html import unescape
+from pathlib import Path
+
+import pandas as pd
+
+import clean_text as ct
+from clean_text import clean_text, clean_texts
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DATA_PATH = BASE_DIR / "data" / "cleaned" / "cleaned_dataset.csv"
+
+
+# ======================================
+# REFERENCE IMPLEMENTATION (PRE-OPTIMIZATION)
+# ======================================
+def clean_text_reference(text: str) -> str:
+    if not isinstance(text, str):
+        return ""
+
+    text = unescape(text).lower()
+
+    text = re.sub(r"\b[\w\.-]+@[\w\.-]+\.\w+\b", " ", text)
+    text = re.sub(r"\b\d{10}\b", " ", text)
+    text = re.sub(r"\b(?:\d{1,3}\.){3}\d{1,3}\b", " ", text)
+
+    text = re.sub(r"[^a-z0-9\s]", " ", text)
+
+    tokens = text.split()
+    tokens = [t for t in tokens if t not in ct.stop_words and len(t) > 2]
+    tokens = [ct.lemmatizer.lemmatize(t) for t in tokens]
+    tokens = list(dict.fromkeys(tokens))
+
+    return " ".join(tokens)
+
+
+def timed(fn, texts):
+    start = time.perf_counter()
+    out = fn(texts)
+    return out, time.perf_counter() - start
+
+
+# ======================================
+# BENCHMARK
+# ======================================
+if __name__ == "__main__":
+    texts = pd.read_csv(DATA_PATH)["text"].tolist()
+    ct.warm_up()
+    print(f"Texts: {len(texts)}")
+
+    ref, t_ref = timed(lambda ts: [clean_text_reference(t) for t in ts], texts)
+    fast, t_fast = timed(lambda ts: [clean_text(t) for t in ts], texts)
+    batch, t_batch = timed(lambda ts: list(clean_texts(ts)), texts)
+
+    mismatches = sum(a != b for a, b in zip(ref, fast))
+    mismatches += sum(a != b for a, b in zip(ref, batch))
+
+    print(f"reference   : {t_ref:.3f}s ({len(texts) / t_ref:,.0f} texts/s)")
+    print(f"clean_text  : {t_fast:.3f}s ({len(texts) / t_fast:,.0f} texts/s)"
+          f"  x{t_ref / t_fast:.1f}")
+    print(f"clean_texts : {t_batch:.3f}s ({len(texts) / t_batch:,.0f} texts/s)"
+          f"  x{t_ref / t_batch:.1f}")
+    print("Mismatches  :", mismatches)
+
+    sys.exit(1 if mismatches else 0)
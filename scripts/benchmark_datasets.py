@@ -0,0 +1,124 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from clean_text import clean_text
+from dataset_io import read_dataset, write_dataset
+from train_model import load_data
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DATA_PATH = BASE_DIR / "data" / "cleaned" / "cleaned_dataset.csv"
+
+FORMATS = (".csv", ".parquet", ".arrow")
+
+# ======================================
+# DATASET FORMAT BENCHMARK
+# ======================================
+# Writes the cleaned dataset (repeated up to --rows) as CSV, Parquet and
+# Arrow, then loads each one in a fresh interpreter and reports wall time
+# and peak RSS above the post-import baseline:
+#   all       every column (read_dataset)
+#   training  train_model.load_data: only the columns training reads,
+#             ending with text_clean ready for the vectorizer (CSV has no
+#             precomputed model_text, so it runs clean_text per row)
+#
+# Usage (from the scripts/ folder):
+#   python benchmark_datasets.py --rows 200000
+
+
+def _rss_kib(field):
+    """
+    VmRSS / VmHWM from /proc (Linux); ru_maxrss elsewhere.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(path, mode):
+    """
+    Runs in the child process; returns (seconds, peak RSS delta in MB).
+    """
+    # Reset the high-water mark so import-time peaks don't hide the load
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+    baseline = _rss_kib("VmRSS")
+    start = time.perf_counter()
+
+    if mode == "all":
+        df = read_dataset(path)
+    else:
+        df = load_data(path)
+
+    seconds = time.perf_counter() - start
+    peak = _rss_kib("VmHWM")
+    del df
+    return seconds, (peak - baseline) / 1024
+
+
+def run_child(path, mode):
+    out = subprocess.run(
+        [sys.executable, __file__, "--measure", str(path), mode],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def build_files(rows, out_dir):
+    base = pd.read_csv(DATA_PATH)
+    repeats = -(-rows // len(base))
+    df = pd.concat([base] * repeats, ignore_index=True).head(rows)
+
+    paths = {}
+    for suffix in FORMATS:
+        start = time.perf_counter()
+        paths[suffix] = write_dataset(
+            df, out_dir / f"dataset{suffix}", cleaner=clean_text
+        )
+        print(f"wrote {suffix:<8} in {time.perf_counter() - start:6.2f}s")
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare dataset formats.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--measure", nargs=2, metavar=("PATH", "MODE"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(Path(args.measure[0]), args.measure[1])))
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = build_files(args.rows, Path(tmp))
+        print(f"\nRows: {args.rows:,}  (best of {args.repeats} runs)\n")
+        print(f"{'format':<9}{'mode':<10}{'size MB':>9}{'load s':>9}"
+              f"{'peak MB':>9}{'x csv':>7}")
+
+        csv_seconds = {}
+        for suffix, path in paths.items():
+            size = path.stat().st_size / 2 ** 20
+            for mode in ("all", "training"):
+                runs = [run_child(path, mode) for _ in range(args.repeats)]
+                seconds = min(r[0] for r in runs)
+                peak = min(r[1] for r in runs)
+                csv_seconds.setdefault(mode, seconds)
+                print(f"{suffix[1:]:<9}{mode:<10}{size:>9.1f}{seconds:>9.3f}"
+                      f"{peak:>9.1f}{csv_seconds[mode] / seconds:>7.1f}")
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+# =====================================
+# PROCESS-WIDE READ CACHE
+# =====================================
+# Results of the scripts/db.py read helpers are kept in memory and shared
+# by every Streamlit session in the process. Entries expire after a TTL,
+# and the write helpers invalidate the groups they touch so readers never
+# wait out the TTL after a change made through this process.
+
+DEFAULT_TTL_SECONDS = 30
+MAX_ENTRIES = 1024
+
+
+def _copy(value):
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, tuple):
+        return tuple(_copy(v) for v in value)
+    return value
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class ReadCache:
+    """
+    TTL cache keyed by (group, call). Each group has a generation number;
+    invalidating a group drops its entries and bumps the generation, and
+    a load that started under an older generation is not stored.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL_SECONDS, max_entries=MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # (group, key) -> (expires, value)
+        self._generation = {}
+        self._stats = {}
+
+    def _group_stats(self, group):
+        return self._stats.setdefault(
+            group, {"hits": 0, "misses": 0, "invalidations": 0}
+        )
+
+    def get_or_load(self, group, key, loader):
+        full_key = (group, key)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[0] > now:
+                self._group_stats(group)["hits"] += 1
+                return entry[1]
+
+            self._group_stats(group)["misses"] += 1
+            generation = self._generation.get(group, 0)
+
+        value = loader()
+
+        with self._lock:
+            if self._generation.get(group, 0) == generation:
+                self._entries[full_key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(full_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return value
+
+    def invalidate(self, *groups):
+        with self._lock:
+            for group in groups:
+                self._generation[group] = self._generation.get(group, 0) + 1
+                self._group_stats(group)["invalidations"] += 1
+
+            for full_key in [k for k in self._entries if k[0] in groups]:
+                del self._entries[full_key]
+
+    def clear(self):
+        with self._lock:
+            for group in {k[0] for k in self._entries}:
+                self._generation[group] = self._generation.get(group, 0) + 1
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Per-group hits, misses, invalidations and live entries.
+        """
+        with self._lock:
+            live = {}
+            for group, _ in self._entries:
+                live[group] = live.get(group, 0) + 1
+
+            return {
+                group: {**counts, "entries": live.get(group, 0)}
+                for group, counts in sorted(self._stats.items())
+            }
+
+
+read_cache = ReadCache()
+
+
+def cached(group):
+    """
+    Caches a read function's results in `group` of the shared read cache.
+    Callers get shallow copies of list/dict results so they can't mutate
+    the cached value.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, _freeze(args), _freeze(kwargs))
+            value = read_cache.get_or_load(
+                group, key, lambda: func(*args, **kwargs)
+            )
+            return _copy(value)
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
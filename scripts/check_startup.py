@@ -0,0 +1,112 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# ======================================
+# STARTUP BUDGET CHECK
+# ======================================
+# Measures cold import/first-run time of the app, each page and the core
+# modules, each in a fresh interpreter, and compares against the budgets
+# in config/startup_budget.json. Exits 1 if any target is over budget.
+#
+# Usage (from the project root):
+#   python scripts/check_startup.py
+#   python scripts/check_startup.py --update   # rewrite the budget file
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+BUDGET_PATH = BASE_DIR / "config" / "startup_budget.json"
+
+# Budget written by --update = measured time * HEADROOM
+HEADROOM = 2.0
+
+MODULE_PROBE = """
+import time
+t = time.perf_counter()
+import {module}
+print(time.perf_counter() - t)
+"""
+
+# Pages run under Streamlit's headless AppTest as a logged-in user. The
+# Streamlit import itself is excluded; only the script run is timed.
+PAGE_PROBE = """
+import time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({path!r}, default_timeout=60)
+at.session_state["logged_in"] = True
+at.session_state["user_id"] = 0
+at.session_state["role"] = "user"
+t = time.perf_counter()
+at.run()
+print(time.perf_counter() - t)
+"""
+
+
+def targets():
+    yield "module:scripts.db", MODULE_PROBE.format(module="scripts.db")
+    yield "module:scripts.clean_text", MODULE_PROBE.format(
+        module="scripts.clean_text"
+    )
+    yield "module:scripts.ai_logic", MODULE_PROBE.format(
+        module="scripts.ai_logic"
+    )
+    yield "page:app.py", PAGE_PROBE.format(path="app.py")
+    for page in sorted((BASE_DIR / "pages").glob("*.py")):
+        rel = page.relative_to(BASE_DIR).as_posix()
+        yield f"page:{rel}", PAGE_PROBE.format(path=rel)
+
+
+def measure(probe: str) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    update = "--update" in sys.argv[1:]
+    budget = {}
+    if BUDGET_PATH.exists():
+        budget = json.loads(BUDGET_PATH.read_text(encoding="utf-8"))
+
+    measured = {}
+    failures = []
+
+    for name, probe in targets():
+        try:
+            ms = measure(probe) * 1000
+        except subprocess.CalledProcessError as e:
+            print(f"❌ {name:32} failed:\n{e.stderr}")
+            failures.append(name)
+            continue
+
+        measured[name] = ms
+        limit = budget.get(name)
+
+        if limit is None:
+            print(f"   {name:32} {ms:8.1f} ms  (no budget)")
+        elif ms > limit:
+            print(f"❌ {name:32} {ms:8.1f} ms  > {limit:.0f} ms")
+            failures.append(name)
+        else:
+            print(f"✅ {name:32} {ms:8.1f} ms  <= {limit:.0f} ms")
+
+    if update:
+        new_budget = {
+            k: round(v * HEADROOM, -1) for k, v in measured.items()
+        }
+        BUDGET_PATH.write_text(
+            json.dumps(new_budget, indent=4) + "\n", encoding="utf-8"
+        )
+        print(f"Budget written to {BUDGET_PATH}")
+        return 0
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
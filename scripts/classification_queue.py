@@ -0,0 +1,208 @@
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from scripts.ai_logic import predict_tickets
+from scripts.db import (
+    PENDING,
+    fetch_pending_tickets,
+    insert_ticket,
+    update_classifications,
+)
+
+logger = logging.getLogger(__name__)
+
+# =====================================
+# ASYNC CLASSIFICATION QUEUE
+# =====================================
+# Ticket creation inserts the ticket with PENDING category/priority and
+# returns at once; a small worker pool classifies queued tickets in
+# micro-batches and writes the results back in one transaction per batch.
+
+MAX_QUEUE_SIZE = 1000      # backpressure: submit() blocks/fails beyond this
+NUM_WORKERS = 2
+MAX_BATCH_SIZE = 64        # tickets per predict/write-back
+MAX_BATCH_WAIT = 0.05      # seconds a worker waits to fill a batch
+MAX_TRACKED = 10000        # ticket statuses kept; oldest finished dropped first
+FINISHED = ("done", "failed")
+
+# Stored when classification raises, so the ticket does not stay PENDING
+FALLBACK = ("miscellaneous", "Low")
+
+
+class QueueFull(Exception):
+    """Raised when the classification queue is at capacity."""
+
+
+class ClassificationQueue:
+    """
+    Bounded queue of (ticket_id, text) plus the worker threads draining it.
+    status(ticket_id) reports queued / processing / done / failed for
+    tickets submitted in this process (the most recent MAX_TRACKED).
+    "failed" means the model raised and FALLBACK was stored instead; the
+    ticket only stays PENDING if that write failed too.
+    """
+
+    def __init__(self, num_workers=NUM_WORKERS, max_size=MAX_QUEUE_SIZE,
+                 max_batch_size=MAX_BATCH_SIZE, max_batch_wait=MAX_BATCH_WAIT):
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self._queue = queue.Queue(maxsize=max_size)
+        self._status = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers = [
+            threading.Thread(
+                target=self._run, name=f"classifier-{i}", daemon=True
+            )
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    # -------------------------
+    # Producer side
+    # -------------------------
+    def submit(self, ticket_id, text, timeout=0.5):
+        """
+        Queues a ticket for classification. Waits up to `timeout` seconds
+        for space and raises QueueFull if there is none.
+        """
+        # Set before put(): a worker may pick the ticket up immediately
+        with self._lock:
+            previous = self._status.get(ticket_id)
+        self._set_status([ticket_id], "queued")
+
+        try:
+            self._queue.put((ticket_id, text), timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                if previous is None:
+                    self._status.pop(ticket_id, None)
+                else:
+                    self._status[ticket_id] = previous
+            raise QueueFull("Classification queue is full") from None
+
+    def status(self, ticket_id):
+        with self._lock:
+            return self._status.get(ticket_id)
+
+    def depth(self):
+        return self._queue.qsize()
+
+    # -------------------------
+    # Worker side
+    # -------------------------
+    def _set_status(self, ticket_ids, state):
+        with self._lock:
+            for tid in ticket_ids:
+                self._status[tid] = state
+                self._status.move_to_end(tid)
+
+            # Least recently updated first; stop at a still-active ticket
+            while len(self._status) > MAX_TRACKED:
+                tid, oldest = next(iter(self._status.items()))
+                if oldest not in FINISHED:
+                    break
+                del self._status[tid]
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_batch_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            ids = [tid for tid, _ in batch]
+            self._set_status(ids, "processing")
+
+            try:
+                classify_now(ids, [text for _, text in batch])
+                self._set_status(ids, "done")
+            except Exception:
+                logger.exception("Classification failed for tickets %s", ids)
+                # Don't leave them PENDING until the next restart
+                try:
+                    write_back(ids, [FALLBACK] * len(ids))
+                except Exception:
+                    logger.exception("Fallback write failed for %s", ids)
+                self._set_status(ids, "failed")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+# =====================================
+# PROCESS-WIDE QUEUE
+# =====================================
+_queue_instance = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """
+    Starts the worker pool on first use and re-queues tickets left
+    pending by a previous process.
+    """
+    global _queue_instance
+
+    with _queue_lock:
+        if _queue_instance is None:
+            _queue_instance = ClassificationQueue()
+
+            for tid, text in fetch_pending_tickets():
+                try:
+                    _queue_instance.submit(tid, text, timeout=0)
+                except QueueFull:
+                    break
+
+    return _queue_instance
+
+
+def classify_now(ticket_ids, texts):
+    """
+    Classifies tickets on the calling thread and writes the results back.
+    """
+    write_back(ticket_ids, predict_tickets(texts))
+
+
+def write_back(ticket_ids, predictions):
+    update_classifications([
+        (f"{category.capitalize()} Issue", category, priority, tid)
+        for tid, (category, priority) in zip(ticket_ids, predictions)
+    ])
+
+
+def create_ticket_async(description):
+    """
+    Inserts a PENDING ticket and queues it for classification.
+    Returns (ticket_id, queued). When the queue is full (backpressure)
+    the ticket is classified synchronously instead and queued is False.
+    """
+    classifier = get_queue()
+
+    ticket_id = insert_ticket(
+        title="New Issue",
+        description=description,
+        category=PENDING,
+        priority=PENDING
+    )
+
+    try:
+        classifier.submit(ticket_id, description)
+        return ticket_id, True
+    except QueueFull:
+        classify_now([ticket_id], [description])
+        return ticket_id, False
@@ -1,40 +1,85 @@
 import re
+import threading
+from functools import lru_cache
 from html import unescape
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import wordnet as wn
 
 # --------------------------------------
 # SAFE NLTK RESOURCE LOADING (DEPLOYMENT)
 # --------------------------------------
-try:
-    nltk.data.find("corpora/stopwords")
-except LookupError:
-    nltk.download("stopwords", quiet=True)
-
-try:
-    nltk.data.find("corpora/wordnet")
-except LookupError:
-    nltk.download("wordnet", quiet=True)
+# Deferred to the first clean_text call (or warm_up()) so importing this
+# module does not import NLTK (~2 s), probe/download corpora or touch
+# WordNet.
+_nlp_lock = threading.Lock()
+stop_words = None
+lemmatizer = None
+
+
+def _load_nlp_resources():
+    global stop_words, lemmatizer
+
+    with _nlp_lock:
+        if lemmatizer is not None:
+            return
+
+        import nltk
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+        from nltk.corpus import wordnet as wn
+
+        for resource, name in [
+            ("corpora/stopwords", "stopwords"),
+            ("corpora/wordnet", "wordnet"),
+            ("corpora/omw-1.4", "omw-1.4"),
+        ]:
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                nltk.download(name, quiet=True)
+
+        # --------------------------------------
+        # 🔴 CRITICAL FIX FOR WordNet Lazy Loader
+        # --------------------------------------
+        # Force eager loading to avoid:
+        # AttributeError: _LazyCorpusLoader__args
+        _ = wn.synsets("test")
+
+        # Initialize NLP tools
+        stop_words = set(stopwords.words("english"))
+        lemmatizer = WordNetLemmatizer()
+
+
+def warm_up():
+    """
+    Loads NLTK resources now instead of on the first clean_text call.
+    """
+    _load_nlp_resources()
 
-try:
-    nltk.data.find("corpora/omw-1.4")
-except LookupError:
-    nltk.download("omw-1.4", quiet=True)
 
 # --------------------------------------
-# 🔴 CRITICAL FIX FOR WordNet Lazy Loader
+# Precompiled patterns
 # --------------------------------------
-# Force eager loading to avoid:
-# AttributeError: _LazyCorpusLoader__args
-_ = wn.synsets("test")
+# Emails, 10-digit phone numbers and IPv4 addresses in one pass
+PII_RE = re.compile(
+    r"\b[\w\.-]+@[\w\.-]+\.\w+\b"
+    r"|\b\d{10}\b"
+    r"|\b(?:\d{1,3}\.){3}\d{1,3}\b"
+)
 
-# --------------------------------------
-# Initialize NLP tools
-# --------------------------------------
-stop_words = set(stopwords.words("english"))
-lemmatizer = WordNetLemmatizer()
+# Runs of [a-z0-9]: replaces "strip punctuation, then split on whitespace"
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+LEMMA_CACHE_SIZE = 100_000
+
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def _normalize_token(token: str):
+    """
+    Stopword/length filter + lemma for one token, memoized.
+    Returns None for tokens that are dropped.
+    """
+    if token in stop_words or len(token) <= 2:
+        return None
+    return lemmatizer.lemmatize(token)
 
 
 def clean_text(text: str) -> str:
@@ -46,27 +91,28 @@ def clean_text(text: str) -> str:
     if not isinstance(text, str):
         return ""
 
+    if lemmatizer is None:
+        _load_nlp_resources()
+
     # 1️⃣ Decode HTML entities & lowercase
     text = unescape(text).lower()
 
     # 2️⃣ Remove PII (emails, phone numbers, IP addresses)
-    text = re.sub(r"\b[\w\.-]+@[\w\.-]+\.\w+\b", " ", text)
-    text = re.sub(r"\b\d{10}\b", " ", text)
-    text = re.sub(r"\b(?:\d{1,3}\.){3}\d{1,3}\b", " ", text)
-
-    # 3️⃣ Remove punctuation & special characters
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
+    text = PII_RE.sub(" ", text)
 
-    # 4️⃣ Tokenization (deployment-safe)
-    tokens = text.split()
+    # 3️⃣ + 4️⃣ Drop punctuation & special characters, tokenize
+    tokens = TOKEN_RE.findall(text)
 
-    # 5️⃣ Stopword removal & short-token filtering
-    tokens = [t for t in tokens if t not in stop_words and len(t) > 2]
-
-    # 6️⃣ Lemmatization (SAFE now)
-    tokens = [lemmatizer.lemmatize(t) for t in tokens]
+    # 5️⃣ + 6️⃣ Stopword removal, short-token filtering, lemmatization
+    lemmas = [_normalize_token(t) for t in tokens]
 
     # 7️⃣ Remove duplicate tokens (preserve order)
-    tokens = list(dict.fromkeys(tokens))
+    return " ".join(dict.fromkeys(t for t in lemmas if t is not None))
+
 
-    return " ".join(tokens)
+def clean_texts(texts):
+    """
+    Generator version of clean_text for batches and streams.
+    """
+    for text in texts:
+        yield clean_text(text)
@@ -0,0 +1,311 @@
+import json
+import re
+import shutil
+import tempfile
+from hashlib import blake2b
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+
+# ======================================
+# COMPACT, MEMORY-MAPPABLE MODEL FORMAT
+# ======================================
+# models/compact/
+#   manifest.json          labels, tokenizer settings, stop words
+#   idf.npy                float32 [n_features]
+#   vocab_hashes.npy       uint64  [n_terms]  sorted 64-bit term hashes
+#   vocab_index.npy        int32   [n_terms]  feature column per hash
+#   <head>_weights.npy     float32 [n_features, n_classes]
+#   <head>_intercept.npy   float32 [n_classes]
+#
+# Every array is opened with np.load(mmap_mode="r"), so processes serving
+# the same files share one page-cache copy and no vocabulary dict or
+# sklearn object is unpickled.
+#
+# Export (from the project root, after training):
+#   python -m scripts.compact_models
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+MODELS_DIR = BASE_DIR / "models"
+COMPACT_DIR = MODELS_DIR / "compact"
+
+FORMAT_VERSION = 1
+
+
+def term_hash(term: str) -> int:
+    return int.from_bytes(
+        blake2b(term.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+# ======================================
+# LOADED OBJECTS (sklearn-compatible subset)
+# ======================================
+class CompactVectorizer:
+    """
+    Re-implements TfidfVectorizer.transform (word analyzer, n-grams,
+    stop words, sublinear tf, idf, l2 norm) over hashed vocabulary arrays.
+    """
+
+    def __init__(self, manifest, idf, vocab_hashes, vocab_index):
+        self.token_re = re.compile(manifest["token_pattern"])
+        self.lowercase = manifest["lowercase"]
+        self.stop_words = frozenset(manifest["stop_words"])
+        self.min_n, self.max_n = manifest["ngram_range"]
+        self.sublinear_tf = manifest["sublinear_tf"]
+        self.norm = manifest["norm"]
+        self.idf = idf
+        self.vocab_hashes = vocab_hashes
+        self.vocab_index = vocab_index
+
+    def _ngrams(self, doc):
+        if self.lowercase:
+            doc = doc.lower()
+        tokens = [
+            t for t in self.token_re.findall(doc) if t not in self.stop_words
+        ]
+
+        for n in range(self.min_n, self.max_n + 1):
+            if n == 1:
+                yield from tokens
+            else:
+                for i in range(len(tokens) - n + 1):
+                    yield " ".join(tokens[i:i + n])
+
+    def transform(self, docs):
+        rows, hashes = [], []
+        n_docs = 0
+        for row, doc in enumerate(docs):
+            n_docs += 1
+            for term in self._ngrams(doc):
+                rows.append(row)
+                hashes.append(term_hash(term))
+
+        n_features = self.idf.shape[0]
+
+        hashes = np.array(hashes, dtype=np.uint64)
+        rows = np.array(rows, dtype=np.int64)
+
+        pos = np.searchsorted(self.vocab_hashes, hashes)
+        pos[pos == len(self.vocab_hashes)] = 0
+        known = self.vocab_hashes[pos] == hashes
+
+        X = sp.csr_matrix(
+            (
+                np.ones(int(known.sum()), dtype=np.float32),
+                (rows[known], self.vocab_index[pos[known]]),
+            ),
+            shape=(n_docs, n_features),
+            dtype=np.float32,
+        )
+        X.sum_duplicates()
+
+        if self.sublinear_tf:
+            np.log(X.data, out=X.data)
+            X.data += 1
+
+        X = X @ sp.diags(self.idf)
+
+        if self.norm == "l2":
+            norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            X = sp.diags(1 / norms) @ X
+
+        return sp.csr_matrix(X, dtype=np.float32)
+
+
+class CompactLinearModel:
+    """
+    decision_function/predict for a linear classifier stored as weights.
+    predict returns label indices, like the pickled models do.
+    """
+
+    def __init__(self, weights, intercept, classes):
+        self.weights = weights
+        self.intercept = intercept
+        self.classes_ = np.asarray(classes)
+
+    def decision_function(self, X):
+        scores = np.asarray(X @ self.weights) + self.intercept
+        return scores.ravel() if scores.shape[1] == 1 else scores
+
+    def predict(self, X):
+        scores = self.decision_function(X)
+        if scores.ndim == 1:
+            return self.classes_[(scores > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+
+
+class CompactLabelEncoder:
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes, dtype=object)
+
+    def inverse_transform(self, y):
+        return self.classes_[np.asarray(y, dtype=int)]
+
+
+# ======================================
+# LOADER
+# ======================================
+def load_compact(path=COMPACT_DIR):
+    """
+    Memory-maps an exported model directory. Returns
+    (vectorizer, category_model, priority_model,
+     category_encoder, priority_encoder).
+    """
+    path = Path(path)
+    manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+
+    if manifest["format_version"] != FORMAT_VERSION:
+        raise RuntimeError(
+            f"Unsupported compact model format: {manifest['format_version']}"
+        )
+
+    def arr(name):
+        return np.load(path / f"{name}.npy", mmap_mode="r")
+
+    vectorizer = CompactVectorizer(
+        manifest["vectorizer"],
+        arr("idf"),
+        arr("vocab_hashes"),
+        arr("vocab_index"),
+    )
+
+    heads = {}
+    for head in ("category", "priority"):
+        heads[head] = (
+            CompactLinearModel(
+                arr(f"{head}_weights"),
+                arr(f"{head}_intercept"),
+                manifest[head]["model_classes"],
+            ),
+            CompactLabelEncoder(manifest[head]["labels"]),
+        )
+
+    return (
+        vectorizer,
+        heads["category"][0],
+        heads["priority"][0],
+        heads["category"][1],
+        heads["priority"][1],
+    )
+
+
+# ======================================
+# EXPORTER
+# ======================================
+def export_compact(vectorizer, category_model, priority_model,
+                   category_encoder, priority_encoder, path=COMPACT_DIR):
+    """
+    Writes fitted sklearn objects in the compact format.
+    """
+    if vectorizer.analyzer != "word" or vectorizer.preprocessor is not None \
+            or vectorizer.tokenizer is not None or vectorizer.strip_accents:
+        raise ValueError("Only plain word-analyzer TF-IDF vectorizers export")
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    terms = list(vectorizer.vocabulary_)
+    hashes = np.array([term_hash(t) for t in terms], dtype=np.uint64)
+    index = np.array([vectorizer.vocabulary_[t] for t in terms], dtype=np.int32)
+
+    if len(np.unique(hashes)) != len(hashes):
+        raise ValueError("Vocabulary hash collision; cannot export")
+
+    order = np.argsort(hashes)
+    np.save(path / "vocab_hashes.npy", hashes[order])
+    np.save(path / "vocab_index.npy", index[order])
+    np.save(path / "idf.npy", vectorizer.idf_.astype(np.float32))
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "vectorizer": {
+            "token_pattern": vectorizer.token_pattern,
+            "lowercase": vectorizer.lowercase,
+            "stop_words": sorted(vectorizer.get_stop_words() or []),
+            "ngram_range": list(vectorizer.ngram_range),
+            "sublinear_tf": vectorizer.sublinear_tf,
+            "norm": vectorizer.norm,
+        },
+    }
+
+    for head, model, encoder in (
+        ("category", category_model, category_encoder),
+        ("priority", priority_model, priority_encoder),
+    ):
+        np.save(path / f"{head}_weights.npy",
+                np.ascontiguousarray(model.coef_.T, dtype=np.float32))
+        np.save(path / f"{head}_intercept.npy",
+                np.asarray(model.intercept_, dtype=np.float32))
+        manifest[head] = {
+            "model_type": type(model).__name__,
+            "model_classes": [int(c) for c in model.classes_],
+            "labels": [str(c) for c in encoder.classes_],
+        }
+
+    (path / "manifest.json").write_text(
+        json.dumps(manifest, indent=2) + "\n", encoding="utf-8"
+    )
+
+
+def stage_compact(vectorizer, category_model, priority_model,
+                  category_encoder, priority_encoder, path=COMPACT_DIR):
+    """
+    Exports into a temp dir next to `path` for publishers that swap all
+    their files in together. Returns (tmp_dir, [(file, target), ...]);
+    the caller os.replace()s each file onto its target, then removes
+    tmp_dir.
+    """
+    path = Path(path)
+    tmp_dir = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}."))
+    try:
+        export_compact(
+            vectorizer, category_model, priority_model,
+            category_encoder, priority_encoder, tmp_dir
+        )
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return tmp_dir, [(f, path / f.name) for f in sorted(tmp_dir.iterdir())]
+
+
+# ======================================
+# CLI: EXPORT + PARITY CHECK
+# ======================================
+if __name__ == "__main__":
+    import joblib
+    import pandas as pd
+
+    pickled = [
+        joblib.load(MODELS_DIR / name)
+        for name in (
+            "tfidf_vectorizer.pkl",
+            "category_model.pkl",
+            "priority_model.pkl",
+            "category_encoder.pkl",
+            "priority_encoder.pkl",
+        )
+    ]
+
+    export_compact(*pickled)
+    compact = load_compact()
+    print("Exported compact models to:", COMPACT_DIR)
+
+    # Predictions on the cleaned test split must match the pickled path
+    texts = pd.read_csv(BASE_DIR / "data" / "splits" / "test.csv")
+    texts = texts["text_clean"].fillna("").astype(str).tolist()
+
+    X_ref = pickled[0].transform(texts)
+    X_new = compact[0].transform(texts)
+
+    mismatches = 0
+    for i in (1, 2):
+        ref = pickled[i].predict(X_ref)
+        new = compact[i].predict(X_new)
+        mismatches += int((ref != new).sum())
+        print(f"{type(pickled[i]).__name__}: "
+              f"{int((ref == new).sum())}/{len(texts)} predictions match")
+
+    raise SystemExit(1 if mismatches else 0)
@@ -0,0 +1,88 @@
+import argparse
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+from train_model import (
+    DATA_PATH,
+    FEATURE_MODES,
+    VECTORIZER_FILES,
+    load_data,
+    save_artifacts,
+    train,
+)
+
+# ======================================
+# FEATURE MODE REPORT
+# ======================================
+# Trains every feature mode on the same data/split and compares accuracy,
+# artifact size, load time and single-ticket latency.
+#
+# Usage (from the scripts/ folder, like train_model.py):
+#   python compare_feature_modes.py --data ../data/cleaned/cleaned_dataset.csv
+
+
+def load_time(model_dir, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for f in model_dir.glob("*.pkl"):
+            with open(f, "rb") as fh:
+                pickle.load(fh)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def per_ticket_latency(artifacts, mode, texts):
+    vectorizer = artifacts[VECTORIZER_FILES[mode]]
+    category_model = artifacts["category_model.pkl"]
+    priority_model = artifacts["priority_model.pkl"]
+
+    start = time.perf_counter()
+    for text in texts:
+        X = vectorizer.transform([text])
+        category_model.predict(X)
+        priority_model.predict(X)
+    return (time.perf_counter() - start) / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare feature modes.")
+    parser.add_argument("--data", type=Path, default=DATA_PATH)
+    parser.add_argument("--latency-samples", type=int, default=500)
+    args = parser.parse_args()
+
+    df = load_data(args.data)
+    sample = df["text_clean"].head(args.latency_samples).tolist()
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in FEATURE_MODES:
+            print(f"\n=== Training ({mode}) ===")
+            artifacts, metrics = train(df, mode, verbose=False)
+
+            out_dir = Path(tmp) / mode
+            save_artifacts(artifacts, out_dir)
+
+            rows.append({
+                "mode": mode,
+                "category_acc": metrics["category_accuracy"],
+                "priority_acc": metrics["priority_accuracy"],
+                "size_mb": sum(
+                    f.stat().st_size for f in out_dir.glob("*.pkl")
+                ) / 1e6,
+                "load_ms": load_time(out_dir) * 1000,
+                "latency_ms": per_ticket_latency(artifacts, mode, sample) * 1000,
+            })
+
+    print("\n| mode | category acc | priority acc | artifacts (MB) "
+          "| load (ms) | per-ticket (ms) |")
+    print("|---|---|---|---|---|---|")
+    for r in rows:
+        print(f"| {r['mode']} | {r['category_acc']:.4f} | {r['priority_acc']:.4f} "
+              f"| {r['size_mb']:.2f} | {r['load_ms']:.1f} | {r['latency_ms']:.3f} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import hashlib
+import inspect
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ======================================
+# COLUMNAR DATASETS (PARQUET / ARROW)
+# ======================================
+# preprocess.py and make_splits.py write Parquet by default:
+#   - typed columns; category/priority are dictionary-encoded
+#   - model_text = clean_text(text) precomputed, so training does not
+#     re-clean every run. The schema metadata records which clean_text
+#     source produced it; has_model_text() treats a mismatch as absent.
+# Readers memory-map the file and read only the requested columns.
+# .arrow (uncompressed Arrow IPC) maps with zero copies; .csv is still
+# read and written for older files.
+
+SUFFIXES = (".parquet", ".arrow", ".csv")    # preference order
+CATEGORICAL_COLUMNS = ("category", "priority")
+MODEL_TEXT = "model_text"
+CLEANER_META_KEY = b"ticket.cleaner_sha"
+PARQUET_COMPRESSION = "zstd"
+
+
+def find_dataset(path):
+    """
+    `path` if it exists, else the same stem in the first format found.
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+
+    for suffix in SUFFIXES:
+        candidate = path.with_suffix(suffix)
+        if candidate.exists():
+            return candidate
+
+    raise FileNotFoundError(
+        f"No dataset at {path} (also tried {', '.join(SUFFIXES)})"
+    )
+
+
+def cleaner_sha(cleaner):
+    """
+    Hash of the source of the module defining `cleaner`.
+    """
+    source = inspect.getsource(inspect.getmodule(cleaner))
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+# ======================================
+# WRITE
+# ======================================
+def to_table(df, cleaner=None):
+    """
+    Arrow table with dictionary-encoded label columns. With a cleaner,
+    model_text is added (unless df already has it) and stamped in the
+    schema metadata.
+    """
+    updates = {
+        col: df[col].astype("category")
+        for col in CATEGORICAL_COLUMNS if col in df
+    }
+    if cleaner is not None and MODEL_TEXT not in df:
+        updates[MODEL_TEXT] = [cleaner(t) for t in df["text"].astype(str)]
+
+    table = pa.Table.from_pandas(df.assign(**updates), preserve_index=False)
+
+    if cleaner is not None:
+        metadata = dict(table.schema.metadata or {})
+        metadata[CLEANER_META_KEY] = cleaner_sha(cleaner).encode()
+        table = table.replace_schema_metadata(metadata)
+    return table
+
+
+def write_dataset(df, path, cleaner=None):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if path.suffix == ".csv":
+        df.to_csv(path, index=False)
+        return path
+
+    table = to_table(df, cleaner)
+    if path.suffix == ".parquet":
+        pq.write_table(table, path, compression=PARQUET_COMPRESSION)
+    elif path.suffix == ".arrow":
+        # Uncompressed so readers can map the buffers as they are
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        raise ValueError(f"Unsupported dataset format: {path.suffix}")
+    return path
+
+
+class DatasetWriter:
+    """
+    Appends DataFrame chunks to one .parquet (a row group per chunk) or
+    .csv file.
+    """
+
+    def __init__(self, path, cleaner=None):
+        self.path = Path(path)
+        self.cleaner = cleaner
+        self.rows = 0
+        self._writer = None
+
+        if self.path.suffix not in (".parquet", ".csv"):
+            raise ValueError(
+                f"Chunked writes support .parquet and .csv, not {self.path.suffix}"
+            )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, df):
+        if self.path.suffix == ".csv":
+            df.to_csv(
+                self.path,
+                mode="w" if self.rows == 0 else "a",
+                header=self.rows == 0,
+                index=False
+            )
+        else:
+            table = to_table(df, self.cleaner)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(
+                    self.path, table.schema, compression=PARQUET_COMPRESSION
+                )
+            self._writer.write_table(table.cast(self._writer.schema))
+
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ======================================
+# READ
+# ======================================
+def _schema(path):
+    if path.suffix == ".parquet":
+        return pq.read_schema(path, memory_map=True)
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).schema
+
+
+def has_model_text(path, cleaner):
+    """
+    True when the file's model_text was produced by this cleaner's code.
+    """
+    path = find_dataset(path)
+    if path.suffix == ".csv":
+        return False
+
+    schema = _schema(path)
+    metadata = schema.metadata or {}
+    return (
+        MODEL_TEXT in schema.names
+        and metadata.get(CLEANER_META_KEY) == cleaner_sha(cleaner).encode()
+    )
+
+
+def _available(path, columns):
+    if columns is None:
+        return None
+    names = set(_schema(path).names)
+    return [c for c in columns if c in names]
+
+
+def read_dataset(path, columns=None):
+    """
+    DataFrame with `columns` (those that exist), memory-mapped for
+    .parquet/.arrow.
+    """
+    path = find_dataset(path)
+
+    if path.suffix == ".csv":
+        usecols = (lambda c: c in columns) if columns is not None else None
+        return pd.read_csv(path, usecols=usecols)
+
+    columns = _available(path, columns)
+    if path.suffix == ".parquet":
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+
+    return table.to_pandas()
+
+
+def iter_dataset(path, columns=None, chunk_size=20000):
+    """
+    Yields DataFrames of up to chunk_size rows.
+    """
+    path = find_dataset(path)
+
+    if path.suffix == ".csv":
+        usecols = (lambda c: c in columns) if columns is not None else None
+        yield from pd.read_csv(path, usecols=usecols, chunksize=chunk_size)
+        return
+
+    columns = _available(path, columns)
+    if path.suffix == ".parquet":
+        parquet = pq.ParquetFile(path, memory_map=True)
+        for batch in parquet.iter_batches(chunk_size, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        for offset in range(0, table.num_rows, chunk_size):
+            yield table.slice(offset, chunk_size).to_pandas()
@@ -1,16 +1,155 @@
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
+
+from scripts.cache import cached, read_cache
+from scripts.metrics import timed
 
 DB_NAME = "tickets.db"
 
+# =====================================
+# CONNECTION SETTINGS
+# =====================================
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 20000             # page cache per connection (~20 MB)
+MMAP_SIZE = 256 * 1024 * 1024     # memory-map up to 256 MB of the file
+STATEMENT_CACHE_SIZE = 256        # prepared statements kept per connection
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA cache_size = -{CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size = {MMAP_SIZE}",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store = MEMORY",
+)
+
+_local = threading.local()
+
+# Database paths whose schema (tables, indexes, triggers) has been
+# ensured by this process
+_schema_ready = set()
+_schema_lock = threading.Lock()
+
+
 # =====================================
 # DATABASE CONNECTION
 # =====================================
+def _open_connection(path):
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        isolation_level=None,
+    )
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
 def get_connection():
     """
-    Creates and returns a SQLite database connection.
-    check_same_thread=False allows Streamlit to access DB safely.
+    Returns this thread's SQLite connection, opening it on first use.
+    Each Streamlit worker thread keeps one connection (WAL mode, tuned
+    pragmas, prepared-statement cache) instead of reconnecting per query.
+    The connection is in autocommit mode; use transaction() to group
+    statements.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.path == DB_NAME:
+        return conn
+
+    close_connection()
+    _local.conn = _open_connection(DB_NAME)
+    _local.path = DB_NAME
+    _local.depth = 0
+    _local.pending = set()
+
+    # Pages can be opened directly without app.py having run, so the
+    # first connection per database also brings the schema up to date
+    if DB_NAME not in _schema_ready:
+        with _schema_lock:
+            if DB_NAME not in _schema_ready:
+                create_table()
+                create_user_table()
+                _schema_ready.add(DB_NAME)
+
+    return _local.conn
+
+
+def close_connection():
+    """
+    Closes this thread's connection (if any).
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+    _local.conn = None
+    _local.path = None
+    _local.depth = 0
+    _local.pending = set()
+
+
+@contextmanager
+def transaction(immediate=False):
+    """
+    Runs the enclosed statements in one transaction and yields a cursor.
+    Commits on success and rolls back on error. Nested blocks join the
+    outermost transaction. immediate=True takes the write lock up front,
+    which avoids lock-upgrade failures for read-then-write blocks.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    if _local.depth:
+        _local.depth += 1
+        try:
+            yield cursor
+        finally:
+            _local.depth -= 1
+            cursor.close()
+        return
+
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    _local.depth = 1
+    try:
+        yield cursor
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+        if _local.pending:
+            read_cache.invalidate(*_local.pending)
+    finally:
+        _local.depth = 0
+        _local.pending = set()
+        cursor.close()
+
+
+def invalidate_reads(*groups):
+    """
+    Drops cached reads for the given groups once the current transaction
+    (if any) commits, so other threads can't re-cache pre-commit data.
     """
-    return sqlite3.connect(DB_NAME, check_same_thread=False)
+    if getattr(_local, "depth", 0):
+        _local.pending.update(groups)
+    else:
+        read_cache.invalidate(*groups)
+
+
+# =====================================
+# READ CACHE GROUPS
+# =====================================
+# Cached read helpers are grouped by what they show; each write helper
+# invalidates exactly the groups its change can affect.
+#   active : fetch_active_tickets      closed : fetch_closed_tickets
+#   pages  : fetch_tickets_page        counts : get_counts
+#   search : search_tickets
+INSERT_GROUPS = ("active", "pages", "counts", "search")
+UPDATE_GROUPS = ("active", "closed", "pages", "counts", "search")
 
 
 # =====================================
@@ -20,144 +159,798 @@ def create_table():
     """
     Creates the tickets table if it does not exist.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    with transaction() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tickets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                category TEXT,
+                priority TEXT,
+                status TEXT DEFAULT 'Open',
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME
+            )
+        """)
+
+        # Status + newest-first listing (closed view, keyset pagination)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tickets_status_created
+            ON tickets (status, created_at)
+        """)
+
+        # Active view filters on status != 'Closed', which the composite
+        # index cannot seek on; a partial index keeps it sort-free
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tickets_active_created
+            ON tickets (created_at)
+            WHERE status != 'Closed'
+        """)
+
+        create_counts_table(cursor)
+        create_search_index(cursor)
+
 
+# =====================================
+# TICKET COUNTERS (MAINTAINED BY TRIGGERS)
+# =====================================
+# NULL category/priority is stored as '' so the primary key stays unique
+COUNTS_KEY = "IFNULL({0}.status, ''), IFNULL({0}.priority, ''), IFNULL({0}.category, '')"
+
+COUNTS_MATCH = (
+    "status = IFNULL({0}.status, '') "
+    "AND priority = IFNULL({0}.priority, '') "
+    "AND category = IFNULL({0}.category, '')"
+)
+
+
+def create_counts_table(cursor):
+    """
+    Creates the ticket_counts table and the triggers that keep it in step
+    with tickets, and backfills it when it is new.
+    """
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS tickets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            description TEXT NOT NULL,
-            category TEXT,
-            priority TEXT,
-            status TEXT DEFAULT 'Open',
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME
-        )
+        CREATE TABLE IF NOT EXISTS ticket_counts (
+            status TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            category TEXT NOT NULL,
+            n INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (status, priority, category)
+        ) WITHOUT ROWID
+    """)
+
+    increment = f"""
+        INSERT INTO ticket_counts (status, priority, category, n)
+        VALUES ({COUNTS_KEY.format("NEW")}, 1)
+        ON CONFLICT (status, priority, category) DO UPDATE SET n = n + 1;
+    """
+    decrement = f"""
+        UPDATE ticket_counts SET n = n - 1
+        WHERE {COUNTS_MATCH.format("OLD")};
+    """
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_ticket_counts_insert
+        AFTER INSERT ON tickets
+        BEGIN {increment} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_ticket_counts_delete
+        AFTER DELETE ON tickets
+        BEGIN {decrement} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_ticket_counts_update
+        AFTER UPDATE OF status, priority, category ON tickets
+        BEGIN {decrement} {increment} END
     """)
 
-    conn.commit()
-    conn.close()
+    needs_backfill = cursor.execute("""
+        SELECT NOT EXISTS (SELECT 1 FROM ticket_counts)
+           AND EXISTS (SELECT 1 FROM tickets)
+    """).fetchone()[0]
+
+    if needs_backfill:
+        rebuild_counts()
+
+
+def rebuild_counts():
+    """
+    Recomputes ticket_counts from tickets in one grouped pass.
+    """
+    with transaction(immediate=True) as cursor:
+        cursor.execute("DELETE FROM ticket_counts")
+        cursor.execute(f"""
+            INSERT INTO ticket_counts (status, priority, category, n)
+            SELECT {COUNTS_KEY.format("tickets")}, COUNT(*)
+            FROM tickets
+            GROUP BY 1, 2, 3
+        """)
+
+    invalidate_reads("counts")
+
+
+def check_counts():
+    """
+    Compares ticket_counts against a fresh grouped count of tickets.
+    Returns a list of (status, priority, category, stored, actual) rows
+    that disagree; an empty list means the counters are consistent.
+    """
+    with transaction() as cursor:
+        actual = {
+            row[:3]: row[3]
+            for row in cursor.execute(f"""
+                SELECT {COUNTS_KEY.format("tickets")}, COUNT(*)
+                FROM tickets
+                GROUP BY 1, 2, 3
+            """)
+        }
+        stored = {
+            row[:3]: row[3]
+            for row in cursor.execute("""
+                SELECT status, priority, category, n
+                FROM ticket_counts
+            """)
+        }
+
+    return [
+        (*key, stored.get(key, 0), actual.get(key, 0))
+        for key in sorted(set(actual) | set(stored))
+        if stored.get(key, 0) != actual.get(key, 0)
+    ]
 
 
 # =====================================
-# CREATE USERS TABLE
+# FULL-TEXT SEARCH INDEX (MAINTAINED BY TRIGGERS)
 # =====================================
-def create_user_table():
+# tickets_fts is an external-content FTS5 index over title and
+# description: it stores only the inverted index and reads the text
+# (for snippets) back from tickets by rowid = id. The 3-character prefix
+# index serves "abc*" queries; shorter prefixes are not allowed.
+def create_search_index(cursor):
     """
-    Creates the users table for authentication.
+    Creates tickets_fts and the triggers that keep it in step with
+    tickets, and builds it when it is new.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    is_new = not cursor.execute("""
+        SELECT 1 FROM sqlite_master WHERE name = 'tickets_fts'
+    """).fetchone()
 
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            role TEXT DEFAULT 'user'
+        CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts USING fts5(
+            title,
+            description,
+            content = 'tickets',
+            content_rowid = 'id',
+            tokenize = 'porter unicode61',
+            prefix = '3'
         )
     """)
 
-    conn.commit()
-    conn.close()
+    add = """
+        INSERT INTO tickets_fts (rowid, title, description)
+        VALUES (NEW.id, NEW.title, NEW.description);
+    """
+    remove = """
+        INSERT INTO tickets_fts (tickets_fts, rowid, title, description)
+        VALUES ('delete', OLD.id, OLD.title, OLD.description);
+    """
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_tickets_fts_insert
+        AFTER INSERT ON tickets
+        BEGIN {add} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_tickets_fts_delete
+        AFTER DELETE ON tickets
+        BEGIN {remove} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_tickets_fts_update
+        AFTER UPDATE OF title, description ON tickets
+        BEGIN {remove} {add} END
+    """)
+
+    if is_new:
+        cursor.execute(
+            "INSERT INTO tickets_fts (tickets_fts) VALUES ('rebuild')"
+        )
+
+
+def rebuild_search_index():
+    """
+    Rebuilds tickets_fts from tickets and merges it into one segment.
+    """
+    with transaction(immediate=True) as cursor:
+        cursor.execute("INSERT INTO tickets_fts (tickets_fts) VALUES ('rebuild')")
+        cursor.execute("INSERT INTO tickets_fts (tickets_fts) VALUES ('optimize')")
+
+    invalidate_reads("search")
+
+
+def check_search_index():
+    """
+    True if tickets_fts matches the tickets table.
+    """
+    try:
+        with transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO tickets_fts (tickets_fts, rank)
+                VALUES ('integrity-check', 1)
+            """)
+    except sqlite3.DatabaseError:
+        return False
+    return True
+
+
+# =====================================
+# CREATE USERS TABLE
+# =====================================
+def create_user_table():
+    """
+    Creates the users table for authentication.
+    """
+    with transaction() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL,
+                role TEXT DEFAULT 'user'
+            )
+        """)
 
 
 # =====================================
 # INSERT NEW TICKET
 # =====================================
+@timed("db.insert_ticket")
 def insert_ticket(title, description, category, priority):
-    conn = get_connection()
-    cursor = conn.cursor()
+    """
+    Inserts a ticket and returns its id.
+    """
+    with transaction(immediate=True) as cursor:
+        cursor.execute("""
+            INSERT INTO tickets (title, description, category, priority)
+            VALUES (?, ?, ?, ?)
+        """, (title, description, category, priority))
+        ticket_id = cursor.lastrowid
 
-    cursor.execute("""
-        INSERT INTO tickets (title, description, category, priority)
-        VALUES (?, ?, ?, ?)
-    """, (title, description, category, priority))
+    invalidate_reads(*INSERT_GROUPS)
+    return ticket_id
+
+
+# =====================================
+# DEFERRED CLASSIFICATION
+# =====================================
+# Tickets created in async mode are stored with PENDING category and
+# priority until a classification worker writes the real values back.
+PENDING = "Pending"
+
+
+@timed("db.update_classifications")
+def update_classifications(rows):
+    """
+    Writes back (title, category, priority, ticket_id) rows for pending
+    tickets in one transaction.
+    """
+    with transaction(immediate=True) as cursor:
+        cursor.executemany("""
+            UPDATE tickets
+            SET title = ?, category = ?, priority = ?
+            WHERE id = ?
+        """, rows)
 
-    conn.commit()
-    conn.close()
+    invalidate_reads(*UPDATE_GROUPS)
+
+
+@timed("db.fetch_pending_tickets")
+def fetch_pending_tickets():
+    """
+    (id, description) of every ticket still awaiting classification.
+    """
+    with transaction() as cursor:
+        return cursor.execute("""
+            SELECT id, description
+            FROM tickets
+            WHERE category = ?
+            ORDER BY id
+        """, (PENDING,)).fetchall()
+
+
+@timed("db.get_ticket_classification")
+def get_ticket_classification(ticket_id):
+    """
+    (category, priority) of one ticket, or None if it does not exist.
+    Not cached, so the UI can poll it.
+    """
+    with transaction() as cursor:
+        return cursor.execute("""
+            SELECT category, priority
+            FROM tickets
+            WHERE id = ?
+        """, (ticket_id,)).fetchone()
 
 
 # =====================================
-# FETCH ACTIVE TICKETS
+# CLOSED-TICKET FEEDBACK (ONLINE MODEL UPDATES)
 # =====================================
-def fetch_active_tickets():
-    conn = get_connection()
-    cursor = conn.cursor()
+@timed("db.fetch_closed_since")
+def fetch_closed_since(after=None, limit=None):
+    """
+    (id, description, category, priority, closed_at) of closed tickets
+    after the (closed_at, id) checkpoint `after`, oldest first. closed_at
+    is updated_at, or created_at for tickets imported as closed.
+    """
+    closed_at = "COALESCE(updated_at, created_at)"
+    where, params = ["status = 'Closed'"], []
 
-    cursor.execute("""
-        SELECT *
-        FROM tickets
-        WHERE status != 'Closed'
-        ORDER BY created_at DESC
-    """)
+    if after is not None:
+        where.append(f"({closed_at} > ? OR ({closed_at} = ? AND id > ?))")
+        params.extend([after[0], after[0], after[1]])
+
+    params.append(-1 if limit is None else limit)
 
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+    with transaction() as cursor:
+        return cursor.execute(f"""
+            SELECT id, description, category, priority, {closed_at}
+            FROM tickets
+            WHERE {" AND ".join(where)}
+            ORDER BY {closed_at}, id
+            LIMIT ?
+        """, params).fetchall()
+
+
+# =====================================
+# BULK INSERT (IMPORTS)
+# =====================================
+def create_import_table():
+    """
+    Tracks how many input records each bulk import has committed.
+    """
+    with transaction() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS import_checkpoints (
+                source TEXT PRIMARY KEY,
+                records INTEGER NOT NULL,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+
+@timed("db.get_import_checkpoint")
+def get_import_checkpoint(source):
+    """
+    Number of input records already committed for `source` (0 if new).
+    """
+    with transaction() as cursor:
+        row = cursor.execute("""
+            SELECT records FROM import_checkpoints WHERE source = ?
+        """, (source,)).fetchone()
+    return row[0] if row else 0
+
+
+@timed("db.insert_tickets_many")
+def insert_tickets_many(rows, source=None, records=None):
+    """
+    Inserts (title, description, category, priority, status, created_at)
+    rows in one transaction; status/created_at may be None for the
+    defaults, otherwise they must already be a canonical status and a
+    UTC "YYYY-MM-DD HH:MM:SS" string (the SLA filters compare it as
+    text). If `source` is given, its checkpoint is set to `records` in
+    the same transaction, so a resumed import never double-inserts.
+    """
+    with transaction(immediate=True) as cursor:
+        cursor.executemany("""
+            INSERT INTO tickets
+                (title, description, category, priority, status, created_at)
+            VALUES (?, ?, ?, ?, COALESCE(?, 'Open'),
+                    COALESCE(?, CURRENT_TIMESTAMP))
+        """, rows)
+
+        if source is not None:
+            cursor.execute("""
+                INSERT INTO import_checkpoints (source, records)
+                VALUES (?, ?)
+                ON CONFLICT (source) DO UPDATE
+                SET records = excluded.records,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (source, records))
+
+    invalidate_reads(*UPDATE_GROUPS)
+
+
+# =====================================
+# FETCH ACTIVE TICKETS
+# =====================================
+@timed("db.fetch_active_tickets")
+@cached("active")
+def fetch_active_tickets():
+    with transaction() as cursor:
+        cursor.execute("""
+            SELECT *
+            FROM tickets
+            WHERE status != 'Closed'
+            ORDER BY created_at DESC
+        """)
+        return cursor.fetchall()
 
 
 # =====================================
 # FETCH CLOSED TICKETS
 # =====================================
+@timed("db.fetch_closed_tickets")
+@cached("closed")
 def fetch_closed_tickets():
-    conn = get_connection()
-    cursor = conn.cursor()
+    with transaction() as cursor:
+        cursor.execute("""
+            SELECT *
+            FROM tickets
+            WHERE status = 'Closed'
+            ORDER BY created_at DESC
+        """)
+        return cursor.fetchall()
 
-    cursor.execute("""
-        SELECT *
-        FROM tickets
-        WHERE status = 'Closed'
-        ORDER BY created_at DESC
-    """)
 
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+# =====================================
+# PAGINATED TICKET LISTING
+# =====================================
+TICKET_COLUMNS = (
+    "id", "title", "description", "category",
+    "priority", "status", "created_at", "updated_at"
+)
+
+# Derived columns callers may select alongside TICKET_COLUMNS
+# (created_at is stored as UTC by CURRENT_TIMESTAMP)
+COMPUTED_COLUMNS = {
+    "age_hours": "(julianday('now') - julianday(created_at)) * 24",
+}
+
+STATUS_FILTERS = {
+    "active": "status != 'Closed'",
+    "closed": "status = 'Closed'",
+}
+
+# SLA buckets on ticket age (see pages/active_tickets.py)
+SLA_FILTERS = {
+    "within": "created_at > datetime('now', '-2 hours')",
+    "approaching": (
+        "created_at <= datetime('now', '-2 hours') "
+        "AND created_at > datetime('now', '-6 hours')"
+    ),
+    "breached": "created_at <= datetime('now', '-6 hours')",
+}
+
+PRIORITY_RANK = (
+    "CASE lower(priority) WHEN 'high' THEN 3 WHEN 'medium' THEN 2 "
+    "WHEN 'low' THEN 1 ELSE 0 END"
+)
+
+# Sort key lists for keyset pagination; each ends in id to stay unique
+TICKET_SORTS = {
+    "newest": (("created_at", "DESC"), ("id", "DESC")),
+    "oldest": (("created_at", "ASC"), ("id", "ASC")),
+    "priority": ((PRIORITY_RANK, "DESC"), ("created_at", "ASC"), ("id", "ASC")),
+}
+
+
+def _ticket_filters(view, category=None, priority=None, status=None, sla=None):
+    if view not in STATUS_FILTERS:
+        raise ValueError(f"Unknown ticket view: {view}")
+    if sla is not None and sla not in SLA_FILTERS:
+        raise ValueError(f"Unknown SLA filter: {sla}")
+
+    where = [STATUS_FILTERS[view]]
+    params = []
+
+    for column, value in (
+        ("category", category), ("priority", priority), ("status", status)
+    ):
+        if value is not None:
+            where.append(f"{column} = ?")
+            params.append(value)
+
+    if sla is not None:
+        where.append(SLA_FILTERS[sla])
+
+    return where, params
+
+
+def _keyset_predicate(keys, after):
+    """
+    WHERE clause selecting rows strictly after `after` in `keys` order.
+    """
+    directions = {direction for _, direction in keys}
+    exprs = [expr for expr, _ in keys]
+
+    # Uniform direction: one row-value comparison the index can seek on
+    if len(directions) == 1:
+        op = "<" if directions == {"DESC"} else ">"
+        marks = ", ".join("?" * len(keys))
+        return f"({', '.join(exprs)}) {op} ({marks})", list(after)
+
+    terms, params = [], []
+    for i, (expr, direction) in enumerate(keys):
+        op = "<" if direction == "DESC" else ">"
+        equal = [f"{e} = ?" for e in exprs[:i]]
+        terms.append("(" + " AND ".join(equal + [f"{expr} {op} ?"]) + ")")
+        params.extend(list(after[:i]) + [after[i]])
+
+    return "(" + " OR ".join(terms) + ")", params
+
+
+@timed("db.fetch_tickets_page")
+@cached("pages")
+def fetch_tickets_page(view="active", columns=None, limit=50, after=None,
+                       category=None, priority=None, status=None, sla=None,
+                       sort="newest"):
+    """
+    Returns one page of tickets plus the cursor for the next page (None
+    on the last page).
+
+    Uses keyset pagination on the sort keys (always ending in id): pass
+    the returned cursor as `after` to continue. `columns` picks a subset
+    of TICKET_COLUMNS / COMPUTED_COLUMNS so list views can skip the
+    description text. category/priority/status/sla filters and the sort
+    order run in SQL.
+    """
+    if sort not in TICKET_SORTS:
+        raise ValueError(f"Unknown sort order: {sort}")
+
+    columns = list(columns or TICKET_COLUMNS)
+    unknown = set(columns) - set(TICKET_COLUMNS) - set(COMPUTED_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown ticket columns: {sorted(unknown)}")
+
+    where, params = _ticket_filters(view, category, priority, status, sla)
+    keys = TICKET_SORTS[sort]
+
+    # Sort keys always ride along at the end to build the cursor
+    select = ", ".join(
+        [COMPUTED_COLUMNS.get(c, c) for c in columns]
+        + [expr for expr, _ in keys]
+    )
+
+    if after is not None:
+        predicate, after_params = _keyset_predicate(keys, after)
+        where.append(predicate)
+        params.extend(after_params)
+
+    order_by = ", ".join(f"{expr} {direction}" for expr, direction in keys)
+    params.append(limit + 1)
+
+    with transaction() as cursor:
+        cursor.execute(f"""
+            SELECT {select}
+            FROM tickets
+            WHERE {" AND ".join(where)}
+            ORDER BY {order_by}
+            LIMIT ?
+        """, params)
+        rows = cursor.fetchall()
+
+    n_keys = len(keys)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = tuple(rows[-1][-n_keys:]) if has_more else None
+
+    return [row[:-n_keys] for row in rows], next_cursor
+
+
+@timed("db.count_tickets")
+@cached("pages")
+def count_tickets(view="active", category=None, priority=None, status=None,
+                  sla=None):
+    """
+    Number of tickets matching the same filters as fetch_tickets_page.
+    """
+    where, params = _ticket_filters(view, category, priority, status, sla)
+
+    with transaction() as cursor:
+        return cursor.execute(f"""
+            SELECT COUNT(*)
+            FROM tickets
+            WHERE {" AND ".join(where)}
+        """, params).fetchone()[0]
+
+
+@timed("db.fetch_ticket_ids")
+def fetch_ticket_ids(view="active", category=None, priority=None,
+                     status=None, sla=None):
+    """
+    IDs of every ticket matching the fetch_tickets_page filters
+    (for bulk actions; not cached).
+    """
+    where, params = _ticket_filters(view, category, priority, status, sla)
+
+    with transaction() as cursor:
+        rows = cursor.execute(f"""
+            SELECT id
+            FROM tickets
+            WHERE {" AND ".join(where)}
+        """, params).fetchall()
+
+    return [r[0] for r in rows]
+
+
+@timed("db.fetch_filter_options")
+@cached("counts")
+def fetch_filter_options(view="active"):
+    """
+    Distinct categories, priorities and statuses present in a view, read
+    from the small ticket_counts table.
+    """
+    if view not in STATUS_FILTERS:
+        raise ValueError(f"Unknown ticket view: {view}")
+
+    with transaction() as cursor:
+        rows = cursor.execute(f"""
+            SELECT status, priority, category
+            FROM ticket_counts
+            WHERE n > 0 AND {STATUS_FILTERS[view]}
+        """).fetchall()
+
+    return {
+        "status": sorted({r[0] for r in rows if r[0]}),
+        "priority": sorted({r[1] for r in rows if r[1]}),
+        "category": sorted({r[2] for r in rows if r[2]}),
+    }
 
 
 # =====================================
-# UPDATE TICKET STATUS
+# FULL-TEXT SEARCH
 # =====================================
-def update_status(ticket_id, status):
-    conn = get_connection()
-    cursor = conn.cursor()
+SEARCH_COLUMNS = ("id", "title", "category", "priority", "status", "created_at")
 
-    cursor.execute("""
-        UPDATE tickets
-        SET status = ?, updated_at = CURRENT_TIMESTAMP
-        WHERE id = ?
-    """, (status, ticket_id))
+# bm25 weights per tickets_fts column: title hits count more
+SEARCH_WEIGHTS = (4.0, 1.0)
+SNIPPET_TOKENS = 16
+
+# BM25 scores every match, so a broad query over a million tickets
+# ("error", "pr*") would score hundreds of thousands of rows. Only the
+# newest SEARCH_MAX_RANKED matches in the requested status view are
+# ranked: a rowid floor found by walking the doclist newest-first (with
+# the status filter applied), which FTS5 applies before scoring. This
+# does not bound the floor walk itself: a broad term in a view holding
+# few of its matches (e.g. "error" among closed tickets) still reads
+# most of the doclist, ~450 ms at 1M tickets.
+SEARCH_MAX_RANKED = 5000
 
-    conn.commit()
-    conn.close()
+
+def _fts_query(text):
+    """
+    User input as an FTS5 query: every word must match, quoted so
+    operators and punctuation are taken literally. A trailing * keeps
+    its prefix meaning for words of 3+ characters ("print*"); stemming
+    already covers plurals.
+    """
+    terms = [
+        f'"{word}"' + ("*" if star and len(word) >= 3 else "")
+        for word, star in re.findall(r"(\w+)(\*?)", text or "")
+    ]
+    return " ".join(terms) or None
+
+
+@timed("db.search_tickets")
+@cached("search")
+def search_tickets(query, status=None, limit=20, offset=0):
+    """
+    Tickets matching `query`, best BM25 match first. Returns
+    (rows, has_more, truncated); each row is SEARCH_COLUMNS plus a
+    description snippet with the matched words in **bold**. truncated
+    means more than SEARCH_MAX_RANKED tickets matched and only the
+    newest of them were ranked. `status` is None (all tickets), a view
+    ("active" / "closed") or an exact status value.
+    """
+    match = _fts_query(query)
+    if match is None:
+        return [], False, False
+
+    where = ["tickets_fts MATCH ?"]
+    params = [match]
+
+    if status in STATUS_FILTERS:
+        where.append(STATUS_FILTERS[status])
+    elif status is not None:
+        where.append("status = ?")
+        params.append(status)
+
+    weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+
+    with transaction() as cursor:
+        # Filtered like the results, so a view's older matches are not
+        # cut off by newer tickets outside it
+        floor = cursor.execute(f"""
+            SELECT tickets_fts.rowid
+            FROM tickets_fts
+            JOIN tickets AS t ON t.id = tickets_fts.rowid
+            WHERE {" AND ".join(where)}
+            ORDER BY tickets_fts.rowid DESC
+            LIMIT 1 OFFSET ?
+        """, [*params, SEARCH_MAX_RANKED]).fetchone()
+
+        # The floor is the newest match left out, so rows above it are
+        # exactly the newest SEARCH_MAX_RANKED
+        truncated = floor is not None
+        if truncated:
+            where.append("tickets_fts.rowid > ?")
+            params.append(floor[0])
+
+        params.extend([limit + 1, offset])
+        rows = cursor.execute(f"""
+            SELECT {", ".join(f"t.{c}" for c in SEARCH_COLUMNS)},
+                   snippet(tickets_fts, 1, '**', '**', '…', {SNIPPET_TOKENS})
+            FROM tickets_fts
+            JOIN tickets AS t ON t.id = tickets_fts.rowid
+            WHERE {" AND ".join(where)}
+            ORDER BY bm25(tickets_fts, {weights})
+            LIMIT ? OFFSET ?
+        """, params).fetchall()
+
+    return rows[:limit], len(rows) > limit, truncated
 
 
 # =====================================
-# ANALYTICS COUNTS
+# UPDATE TICKET STATUS
 # =====================================
-def get_counts():
-    conn = get_connection()
-    cursor = conn.cursor()
+@timed("db.update_status")
+def update_status(ticket_id, status):
+    with transaction(immediate=True) as cursor:
+        cursor.execute("""
+            UPDATE tickets
+            SET status = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (status, ticket_id))
 
-    total = cursor.execute(
-        "SELECT COUNT(*) FROM tickets"
-    ).fetchone()[0]
+    invalidate_reads(*UPDATE_GROUPS)
 
-    open_tickets = cursor.execute(
-        "SELECT COUNT(*) FROM tickets WHERE status = 'Open'"
-    ).fetchone()[0]
 
-    high_priority = cursor.execute(
-        "SELECT COUNT(*) FROM tickets WHERE priority = 'High'"
-    ).fetchone()[0]
+# =====================================
+# BULK UPDATE TICKET STATUS
+# =====================================
+@timed("db.update_status_many")
+def update_status_many(ticket_ids, status):
+    """
+    Sets the same status on many tickets in one transaction.
+    Returns the number of tickets updated.
+    """
+    ticket_ids = list(dict.fromkeys(ticket_ids))
+    if not ticket_ids:
+        return 0
+
+    with transaction(immediate=True) as cursor:
+        cursor.executemany("""
+            UPDATE tickets
+            SET status = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, [(status, tid) for tid in ticket_ids])
+        updated = cursor.rowcount
 
-    closed_tickets = cursor.execute(
-        "SELECT COUNT(*) FROM tickets WHERE status = 'Closed'"
-    ).fetchone()[0]
+    invalidate_reads(*UPDATE_GROUPS)
+    return updated
 
-    conn.close()
+
+# =====================================
+# ANALYTICS COUNTS
+# =====================================
+@timed("db.get_counts")
+@cached("counts")
+def get_counts():
+    """
+    Dashboard totals, read from the trigger-maintained ticket_counts
+    table (one row per status/priority/category) instead of scanning
+    tickets.
+    """
+    with transaction() as cursor:
+        total, open_tickets, high_priority, closed_tickets = cursor.execute("""
+            SELECT
+                IFNULL(SUM(n), 0),
+                IFNULL(SUM(CASE WHEN status = 'Open' THEN n END), 0),
+                IFNULL(SUM(CASE WHEN priority = 'High' THEN n END), 0),
+                IFNULL(SUM(CASE WHEN status = 'Closed' THEN n END), 0)
+            FROM ticket_counts
+        """).fetchone()
 
     return {
         "total": total,
@@ -170,32 +963,24 @@ def get_counts():
 # =====================================
 # REGISTER USER
 # =====================================
+@timed("db.register_user")
 def register_user(username, hashed_password, role="user"):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        INSERT INTO users (username, password, role)
-        VALUES (?, ?, ?)
-    """, (username, hashed_password, role))
-
-    conn.commit()
-    conn.close()
+    with transaction(immediate=True) as cursor:
+        cursor.execute("""
+            INSERT INTO users (username, password, role)
+            VALUES (?, ?, ?)
+        """, (username, hashed_password, role))
 
 
 # =====================================
 # LOGIN USER
 # =====================================
+@timed("db.login_user")
 def login_user(username, hashed_password):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT id, role
-        FROM users
-        WHERE username = ? AND password = ?
-    """, (username, hashed_password))
-
-    user = cursor.fetchone()
-    conn.close()
-    return user
+    with transaction() as cursor:
+        cursor.execute("""
+            SELECT id, role
+            FROM users
+            WHERE username = ? AND password = ?
+        """, (username, hashed_password))
+        return cursor.fetchone()
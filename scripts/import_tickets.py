@@ -0,0 +1,246 @@
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple
+
+from scripts.ai_logic import predict_tickets
+from scripts.db import (
+    create_import_table,
+    get_import_checkpoint,
+    insert_tickets_many,
+)
+
+# ======================================
+# STREAMING BULK TICKET IMPORT
+# ======================================
+# Streams a CSV or JSONL file, classifies tickets in fixed-size batches
+# and writes each batch with executemany in its own transaction. The
+# number of committed input records is stored in tickets.db alongside the
+# batch, so an interrupted run resumes where it stopped.
+#
+# Usage (from the project root):
+#   python -m scripts.import_tickets data/raw/final_dataset_utf8.csv
+#   python -m scripts.import_tickets requests.jsonl --text-field body
+
+DEFAULT_BATCH_SIZE = 2000
+TEXT_FIELDS = ("description", "text", "body")
+MAX_REPORTED_INVALID = 20
+
+# Input status spellings (lower case, separators removed) -> stored status
+STATUSES = {
+    "open": "Open",
+    "inprogress": "In Progress",
+    "resolved": "Resolved",
+    "closed": "Closed",
+}
+# created_at is stored like CURRENT_TIMESTAMP: UTC, second precision
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Epoch seconds written as text; ISO dates always contain a "-"
+EPOCH_STRING = re.compile(r"\d+(\.\d+)?")
+
+
+class BadRecord(NamedTuple):
+    """
+    Stands in for a JSONL line that is not a JSON object, so it is
+    counted as a record (keeping the checkpoint aligned) and as invalid.
+    """
+    line: int
+    error: str
+
+
+def read_records(path, fmt):
+    """
+    Yields input records as dicts (or BadRecord), one at a time.
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield BadRecord(line_no, f"malformed JSON ({e})")
+                    continue
+                if isinstance(record, dict):
+                    yield record
+                else:
+                    yield BadRecord(line_no, "not a JSON object")
+
+
+def pick_text_field(record, text_field):
+    if text_field:
+        return text_field
+    for field in TEXT_FIELDS:
+        if field in record:
+            return field
+    raise ValueError(
+        f"No text field found (tried {', '.join(TEXT_FIELDS)}); "
+        "pass --text-field"
+    )
+
+
+# ======================================
+# FIELD NORMALIZATION
+# ======================================
+# The pages and the SQL SLA filters rely on the canonical statuses and
+# on created_at comparing as a string against datetime('now', ...).
+# Empty values become None (the column default); values that cannot be
+# normalized raise ValueError and the record is skipped as invalid.
+def normalize_status(value):
+    if value is None or not str(value).strip():
+        return None
+    key = "".join(c for c in str(value).lower() if c.isalnum())
+    if key not in STATUSES:
+        raise ValueError(f"unknown status {value!r}")
+    return STATUSES[key]
+
+
+def normalize_created_at(value):
+    """
+    ISO-8601 strings (any offset; naive means UTC) or Unix epoch
+    seconds, as JSON numbers or digit strings such as CSV's "1700000000"
+    -> "YYYY-MM-DD HH:MM:SS" in UTC.
+    """
+    if value is None or not str(value).strip():
+        return None
+    if isinstance(value, str) and EPOCH_STRING.fullmatch(value.strip()):
+        value = float(value)
+    if isinstance(value, (int, float)):
+        ts = datetime.fromtimestamp(value, timezone.utc)
+    else:
+        ts = datetime.fromisoformat(str(value).strip())
+        if ts.tzinfo is not None:
+            ts = ts.astimezone(timezone.utc)
+    return ts.strftime(TIMESTAMP_FORMAT)
+
+
+def to_row(record, text_field, args, category, priority):
+    title = record.get(args.title_field) if args.title_field else None
+    status = record.get(args.status_field) if args.status_field else None
+    created = (
+        record.get(args.created_at_field) if args.created_at_field else None
+    )
+    return (
+        title or f"{category.capitalize()} Issue",
+        record[text_field],
+        category,
+        priority,
+        normalize_status(status),
+        normalize_created_at(created),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import tickets.")
+    parser.add_argument("input", type=Path)
+    parser.add_argument("--format", choices=("csv", "jsonl"))
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--text-field", help="column holding the description")
+    parser.add_argument("--title-field")
+    parser.add_argument("--status-field")
+    parser.add_argument("--created-at-field")
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="ignore the saved checkpoint and start from the first record"
+    )
+    parser.add_argument(
+        "--allow-duplicates",
+        action="store_true",
+        help="confirm --restart when records of this file were already "
+             "imported (they are inserted again)"
+    )
+    args = parser.parse_args()
+
+    fmt = args.format or (
+        "csv" if args.input.suffix.lower() == ".csv" else "jsonl"
+    )
+    source = str(args.input.resolve())
+
+    create_import_table()
+    done = get_import_checkpoint(source)
+
+    # Imported tickets carry no source key, so a restart cannot undo the
+    # earlier run; it re-inserts everything up to the checkpoint
+    if args.restart and done:
+        if not args.allow_duplicates:
+            print(f"❌ {done:,} records of {source} were already imported; "
+                  "--restart would insert them again. Pass "
+                  "--allow-duplicates to do so anyway.")
+            return 2
+        print(f"Restarting: the first {done:,} records will be duplicated")
+        done = 0
+    elif done:
+        print(f"Resuming after {done:,} records")
+
+    records = islice(read_records(args.input, fmt), done, None)
+    text_field = None
+    imported = skipped = invalid = 0
+    start = time.perf_counter()
+
+    while True:
+        batch = list(islice(records, args.batch_size))
+        if not batch:
+            break
+
+        bad = [r for r in batch if isinstance(r, BadRecord)]
+        for r in bad:
+            invalid += 1
+            if invalid <= MAX_REPORTED_INVALID:
+                print(f"  ⚠️ Skipped line {r.line:,}: {r.error}")
+
+        good = [
+            (n, r) for n, r in enumerate(batch, done + 1)
+            if not isinstance(r, BadRecord)
+        ]
+        if good:
+            text_field = text_field or pick_text_field(
+                good[0][1], args.text_field
+            )
+
+        valid = [
+            (n, r) for n, r in good
+            if isinstance(r.get(text_field), str) and r[text_field].strip()
+        ]
+        predictions = predict_tickets(
+            [r[text_field] for _, r in valid], batch_size=args.batch_size
+        )
+
+        rows = []
+        for (n, r), (category, priority) in zip(valid, predictions):
+            try:
+                rows.append(to_row(r, text_field, args, category, priority))
+            except (ValueError, OverflowError, OSError) as e:
+                invalid += 1
+                if invalid <= MAX_REPORTED_INVALID:
+                    print(f"  ⚠️ Skipped record {n:,}: {e}")
+
+        skipped += len(good) - len(valid)
+        done += len(batch)
+        insert_tickets_many(rows, source=source, records=done)
+
+        imported += len(rows)
+        elapsed = time.perf_counter() - start
+        print(f"  {done:>10,} records read | {imported:,} imported "
+              f"| {skipped:,} empty | {invalid:,} invalid "
+              f"| {imported / elapsed:,.0f} tickets/s",
+              flush=True)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Imported {imported:,} tickets in {elapsed:.1f}s "
+          f"({imported / max(elapsed, 1e-9):,.0f} tickets/s), "
+          f"skipped {skipped:,} empty and {invalid:,} invalid records")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,415 @@
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from scripts.clean_text import clean_text
+from scripts.clean_text import warm_up as warm_up_text_cleaning
+from scripts.entity_extraction import extract_entities
+from scripts.keyword_rules import load_rules
+from scripts.metrics import observe
+
+# =====================================
+# UNIFIED INFERENCE PIPELINE
+# =====================================
+# One pipeline behind every predictor (Streamlit app, scripts/predict.py,
+# scripts/generate_ticket.py, the inference server):
+#
+#   clean -> vectorize -> rules -> models -> urgency -> entities
+#
+# Stages work on a whole Batch at a time and share one process-wide set
+# of model artifacts. Each stage's wall time is recorded in
+# pipeline.timings and in the "inference.<stage>" latency histograms
+# (scripts/metrics.py).
+
+# =====================================
+# PROJECT ROOT & MODELS DIR
+# =====================================
+BASE_DIR = Path(__file__).resolve().parents[1]
+# TICKET_MODELS_DIR serves another model root with the same layout, e.g.
+# models/streaming/ from train_model.py --streaming
+MODELS_DIR = Path(os.environ.get("TICKET_MODELS_DIR", BASE_DIR / "models"))
+
+# "pickle" (sklearn objects) or "compact" (memory-mapped arrays written
+# by `python -m scripts.compact_models`; shared page cache, fast start)
+MODEL_FORMAT = os.environ.get("TICKET_MODEL_FORMAT", "pickle")
+
+# "tfidf" (vocabulary-based, models/) or "hashing" (stateless hashing
+# features + IDF vector, models/hashing/; see train_model.py --features)
+FEATURE_MODE = os.environ.get("TICKET_FEATURE_MODE", "tfidf")
+
+VECTORIZER_FILES = {
+    "tfidf": "tfidf_vectorizer.pkl",
+    "hashing": "hashing_vectorizer.pkl",
+}
+
+# Keyword rules profile in config/keyword_rules.json
+RULES_PROFILE = "default"
+RULES = load_rules(RULES_PROFILE)
+
+
+# =====================================
+# SHARED MODEL ARTIFACTS (LAZY, ONCE PER PROCESS)
+# =====================================
+class ModelArtifacts(NamedTuple):
+    vectorizer: Any
+    category_model: Any
+    priority_model: Any
+    category_encoder: Any
+    priority_encoder: Any
+
+
+_artifacts = None
+_artifacts_lock = threading.Lock()
+_warm_up_thread = None
+
+
+def _load_artifacts() -> ModelArtifacts:
+    if FEATURE_MODE not in VECTORIZER_FILES:
+        raise RuntimeError(f"❌ Unknown feature mode: {FEATURE_MODE}")
+
+    if MODEL_FORMAT == "compact":
+        if FEATURE_MODE != "tfidf":
+            raise RuntimeError("❌ Compact format only supports tfidf features")
+
+        from scripts.compact_models import load_compact
+
+        try:
+            return ModelArtifacts(*load_compact(MODELS_DIR / "compact"))
+        except Exception as e:
+            raise RuntimeError(f"❌ Failed to load compact model files:\n{e}")
+
+    import joblib
+
+    model_dir = MODELS_DIR
+    if FEATURE_MODE != "tfidf":
+        model_dir = MODELS_DIR / FEATURE_MODE
+
+    try:
+        return ModelArtifacts(
+            vectorizer=joblib.load(model_dir / VECTORIZER_FILES[FEATURE_MODE]),
+            category_model=joblib.load(model_dir / "category_model.pkl"),
+            priority_model=joblib.load(model_dir / "priority_model.pkl"),
+            category_encoder=joblib.load(model_dir / "category_encoder.pkl"),
+            priority_encoder=joblib.load(model_dir / "priority_encoder.pkl"),
+        )
+    except Exception as e:
+        raise RuntimeError(f"❌ Failed to load model files:\n{e}")
+
+
+def get_artifacts() -> ModelArtifacts:
+    """
+    Process-wide model singleton. The first caller loads the pickles;
+    concurrent callers wait for that load instead of repeating it.
+    """
+    global _artifacts
+
+    if _artifacts is None:
+        with _artifacts_lock:
+            if _artifacts is None:
+                _artifacts = _load_artifacts()
+
+    return _artifacts
+
+
+def warm_up():
+    """
+    Starts loading the models and NLTK resources in a background thread
+    (at most once per process) so the first prediction does not pay for
+    it. Returns the thread.
+    """
+    global _warm_up_thread
+
+    with _artifacts_lock:
+        if _warm_up_thread is None:
+            def _run():
+                get_artifacts()
+                warm_up_text_cleaning()
+
+            _warm_up_thread = threading.Thread(
+                target=_run, name="model-warm-up", daemon=True
+            )
+            _warm_up_thread.start()
+
+    return _warm_up_thread
+
+
+# =====================================
+# BATCH STATE
+# =====================================
+class Batch:
+    """
+    Column-wise state for a batch of ticket texts, filled in by stages.
+    Rows whose cleaned text is empty are not valid and skip the model,
+    urgency and entity stages (category/priority stay None).
+    """
+
+    def __init__(self, texts):
+        n = len(texts)
+        self.texts = texts
+        self.cleaned = None
+        self.valid = np.zeros(n, dtype=bool)
+        self.rows = np.zeros(0, dtype=np.intp)   # indices of valid rows
+        self.X = None                            # features of valid rows
+        self.category = np.full(n, None, dtype=object)
+        self.priority = np.full(n, None, dtype=object)
+        self.confidence = np.zeros(n, dtype=float)
+        self.entities = [{} for _ in range(n)]
+
+    def __len__(self):
+        return len(self.texts)
+
+
+# =====================================
+# STAGES
+# =====================================
+class Stage:
+    """
+    A pipeline step. Subclasses set `name` and implement __call__(batch),
+    updating the batch in place.
+    """
+    name = "stage"
+
+    def __call__(self, batch: Batch):
+        raise NotImplementedError
+
+
+class CleanStage(Stage):
+    name = "clean"
+
+    def __call__(self, batch):
+        batch.cleaned = [clean_text(t) for t in batch.texts]
+        batch.valid = np.array(
+            [bool(c.strip()) for c in batch.cleaned], dtype=bool
+        )
+        batch.rows = np.flatnonzero(batch.valid)
+
+
+class VectorizeStage(Stage):
+    name = "vectorize"
+
+    def __call__(self, batch):
+        if len(batch.rows):
+            batch.X = get_artifacts().vectorizer.transform(
+                [batch.cleaned[i] for i in batch.rows]
+            )
+
+
+class RulesStage(Stage):
+    """
+    High-confidence keyword categories (confidence 1.0); the model stage
+    only fills rows no rule matched.
+    """
+    name = "rules"
+
+    def __init__(self, rules):
+        self.rules = rules
+
+    def __call__(self, batch):
+        for i in batch.rows:
+            category = self.rules.category(batch.cleaned[i])
+            if category is not None:
+                batch.category[i] = category
+                batch.confidence[i] = 1.0
+
+
+class ModelStage(Stage):
+    """
+    Category (LinearSVC, confidence = top decision score) and priority
+    (LogisticRegression). With min_confidence set, model categories
+    scoring below it become "miscellaneous".
+    """
+    name = "models"
+
+    def __init__(self, min_confidence=None):
+        self.min_confidence = min_confidence
+
+    def __call__(self, batch):
+        if not len(batch.rows):
+            return
+
+        m = get_artifacts()
+        rows = batch.rows
+
+        scores = m.category_model.decision_function(batch.X)
+        if scores.ndim == 1:
+            labels = m.category_model.predict(batch.X)
+            confidence = np.abs(scores)
+        else:
+            labels = m.category_model.classes_[scores.argmax(axis=1)]
+            confidence = scores.max(axis=1)
+
+        categories = m.category_encoder.inverse_transform(labels)
+        if self.min_confidence is not None:
+            categories = np.where(
+                confidence < self.min_confidence, "miscellaneous", categories
+            )
+
+        unmatched = batch.category[rows] == None  # noqa: E711
+        batch.category[rows[unmatched]] = categories[unmatched]
+        batch.confidence[rows[unmatched]] = confidence[unmatched]
+
+        batch.priority[rows] = m.priority_encoder.inverse_transform(
+            m.priority_model.predict(batch.X)
+        )
+
+
+class UrgencyStage(Stage):
+    """
+    Urgency keywords in the raw text escalate priority to "high".
+    """
+    name = "urgency"
+
+    def __init__(self, rules):
+        self.rules = rules
+
+    def __call__(self, batch):
+        for i in batch.rows:
+            if self.rules.is_urgent(batch.texts[i]):
+                batch.priority[i] = "high"
+
+
+class EntityStage(Stage):
+    name = "entities"
+
+    def __call__(self, batch):
+        for i in batch.rows:
+            batch.entities[i] = extract_entities(batch.texts[i])
+
+
+# =====================================
+# PIPELINE
+# =====================================
+class InferencePipeline:
+    """
+    Runs stages in order over a Batch and accumulates per-stage timing.
+    run(texts, until="urgency") stops after the named stage, e.g. to skip
+    entity extraction when only category/priority are needed.
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+        self._lock = threading.Lock()
+        self._timings = {
+            s.name: {"calls": 0, "rows": 0, "seconds": 0.0}
+            for s in self.stages
+        }
+
+    def run(self, texts, until=None) -> Batch:
+        if until is not None and until not in self._timings:
+            raise ValueError(f"Unknown pipeline stage: {until}")
+
+        batch = Batch(list(texts))
+        run_start = time.perf_counter()
+
+        for stage in self.stages:
+            start = time.perf_counter()
+            stage(batch)
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                t = self._timings[stage.name]
+                t["calls"] += 1
+                t["rows"] += len(batch)
+                t["seconds"] += elapsed
+            observe(f"inference.{stage.name}", elapsed)
+
+            if stage.name == until:
+                break
+
+        observe("inference.total", time.perf_counter() - run_start)
+        return batch
+
+    @property
+    def timings(self):
+        """
+        Per-stage totals plus mean milliseconds per call and per row.
+        """
+        with self._lock:
+            out = {}
+            for name, t in self._timings.items():
+                out[name] = {
+                    **t,
+                    "ms_per_call": 1000 * t["seconds"] / max(t["calls"], 1),
+                    "ms_per_row": 1000 * t["seconds"] / max(t["rows"], 1),
+                }
+            return out
+
+
+def build_pipeline(rules=None, min_confidence=None) -> InferencePipeline:
+    rules = rules or RULES
+    return InferencePipeline([
+        CleanStage(),
+        VectorizeStage(),
+        RulesStage(rules),
+        ModelStage(min_confidence),
+        UrgencyStage(rules),
+        EntityStage(),
+    ])
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline() -> InferencePipeline:
+    """
+    The shared pipeline used by every entry point in this process.
+    """
+    global _pipeline
+
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = build_pipeline()
+
+    return _pipeline
+
+
+# =====================================
+# OUTPUT FORMATS
+# =====================================
+def to_ticket(batch: Batch, i: int, created_at=None):
+    """
+    Structured ticket dict for row i (generate_ticket output format).
+    """
+    created_at = created_at or datetime.now().isoformat()
+    text = batch.texts[i]
+
+    if not batch.valid[i]:
+        return {
+            "title": "Invalid Ticket",
+            "description": text,
+            "category": "unknown",
+            "priority": "low",
+            "confidence_score": 0.0,
+            "entities": {},
+            "created_at": created_at,
+            "status": "open"
+        }
+
+    category = batch.category[i]
+    return {
+        "title": f"{category.capitalize()} Issue",
+        "description": text,
+        "cleaned_description": batch.cleaned[i],
+        "category": category,
+        "priority": batch.priority[i],
+        "confidence_score": round(float(batch.confidence[i]), 3),
+        "entities": batch.entities[i],
+        "created_at": created_at,
+        "status": "open"
+    }
+
+
+def generate_tickets(texts):
+    """
+    Structured tickets for many descriptions, in input order.
+    """
+    batch = get_pipeline().run(texts)
+    created_at = datetime.now().isoformat()
+    return [to_ticket(batch, i, created_at) for i in range(len(batch))]
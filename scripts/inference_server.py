@@ -0,0 +1,368 @@
+import argparse
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scripts.clean_text import warm_up as warm_up_text_cleaning
+from scripts.inference_pipeline import generate_tickets, get_artifacts
+from scripts.metrics import metrics as stage_metrics
+from scripts.metrics import observe
+
+logger = logging.getLogger(__name__)
+
+# ======================================
+# LOCAL INFERENCE HTTP SERVICE
+# ======================================
+# Serves generate_ticket-style JSON over HTTP so other internal tools can
+# classify tickets without loading the models themselves. Concurrent
+# requests are merged into micro-batches: the batcher thread waits up to
+# --batch-window-ms for more work and runs one vectorize/predict call for
+# the whole batch.
+#
+#   POST /predict   {"text": "..."}          -> one ticket
+#                   {"texts": ["...", ...]}  -> {"tickets": [...]}
+#   GET  /healthz   process is up
+#   GET  /readyz    models loaded (503 while loading or if loading failed)
+#   GET  /metrics   request/batch counters and latency percentiles
+#   GET  /metrics/prometheus
+#                   latency histograms (Prometheus text format): the
+#                   pipeline stages plus server.request and
+#                   server.batch_predict, the same ones /metrics reads
+#
+# Usage (from the project root):
+#   python -m scripts.inference_server --port 8765 --batch-window-ms 10
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_WINDOW_MS = 10
+DEFAULT_MAX_BATCH_SIZE = 64
+MAX_QUEUE_SIZE = 1024           # pending requests before 503
+MAX_TEXTS_PER_REQUEST = 1000
+MAX_BODY_BYTES = 1 << 20
+REQUEST_TIMEOUT = 30            # seconds a handler waits for its result
+
+# Latency histograms in the scripts.metrics registry
+REQUEST_METRIC = "server.request"
+BATCH_METRIC = "server.batch_predict"
+
+
+class Overloaded(Exception):
+    """Raised when the batch queue is full."""
+
+
+# ======================================
+# METRICS
+# ======================================
+class Metrics:
+    """
+    Thread-safe request/batch counters. Latencies go to the shared
+    scripts.metrics histograms, so /metrics and /metrics/prometheus
+    report the same numbers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters = {
+            "requests": 0, "texts": 0, "errors": 0,
+            "rejected": 0, "batches": 0, "batched_texts": 0,
+        }
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def observe_request(self, seconds, n_texts):
+        observe(REQUEST_METRIC, seconds)
+        with self._lock:
+            self.counters["requests"] += 1
+            self.counters["texts"] += n_texts
+
+    def observe_batch(self, seconds, size):
+        observe(BATCH_METRIC, seconds)
+        with self._lock:
+            self.counters["batches"] += 1
+            self.counters["batched_texts"] += size
+
+    def snapshot(self, queue_depth):
+        with self._lock:
+            counters = dict(self.counters)
+        histograms = stage_metrics.snapshot()
+
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "queue_depth": queue_depth,
+            **counters,
+            "mean_batch_size": round(
+                counters["batched_texts"] / max(counters["batches"], 1), 2
+            ),
+            "request_latency": histograms.get(REQUEST_METRIC),
+            "batch_predict": histograms.get(BATCH_METRIC),
+        }
+
+
+# ======================================
+# MICRO-BATCHER
+# ======================================
+class MicroBatcher:
+    """
+    Collects submitted texts for up to `window` seconds (or until
+    max_batch_size texts are waiting) and runs generate_tickets once for
+    all of them. submit() returns a Future per request.
+    """
+
+    def __init__(self, metrics, window=DEFAULT_BATCH_WINDOW_MS / 1000,
+                 max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_queue_size=MAX_QUEUE_SIZE):
+        self.metrics = metrics
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, texts):
+        future = Future()
+        try:
+            self._queue.put_nowait((texts, future))
+        except queue.Full:
+            raise Overloaded("Inference queue is full") from None
+        return future
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.window
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            texts = [t for item_texts, _ in batch for t in item_texts]
+
+            start = time.perf_counter()
+            try:
+                tickets = generate_tickets(texts)
+            except Exception as e:
+                logger.exception("Batch of %d texts failed", len(texts))
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.metrics.observe_batch(time.perf_counter() - start, len(texts))
+
+            offset = 0
+            for item_texts, future in batch:
+                future.set_result(tickets[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+
+# ======================================
+# HTTP HANDLER
+# ======================================
+class InferenceHandler(BaseHTTPRequestHandler):
+    server_version = "TicketInference/1.0"
+
+    # Set on the server instance in make_server()
+    @property
+    def batcher(self):
+        return self.server.batcher
+
+    @property
+    def metrics(self):
+        return self.server.metrics
+
+    def log_message(self, fmt, *args):
+        logger.debug("%s - %s", self.address_string(), fmt % args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send_json(status, {"error": message})
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/readyz":
+            if self.server.ready.is_set():
+                self._send_json(200, {"status": "ready"})
+            elif self.server.load_error is not None:
+                self._send_json(
+                    503, {"status": "failed", "error": self.server.load_error}
+                )
+            else:
+                self._send_json(503, {"status": "loading"})
+        elif self.path == "/metrics":
+            self._send_json(200, self.metrics.snapshot(self.batcher.depth()))
+        elif self.path == "/metrics/prometheus":
+            body = stage_metrics.export_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._error(404, "Not found")
+
+    def _read_texts(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            raise ValueError("Request body is empty")
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Request body too large")
+
+        payload = json.loads(self.rfile.read(length))
+        if not isinstance(payload, dict):
+            raise ValueError("Body must be a JSON object")
+
+        if "texts" in payload:
+            texts = payload["texts"]
+            if not isinstance(texts, list) or not texts:
+                raise ValueError("'texts' must be a non-empty list")
+            if len(texts) > MAX_TEXTS_PER_REQUEST:
+                raise ValueError(
+                    f"At most {MAX_TEXTS_PER_REQUEST} texts per request"
+                )
+            single = False
+        elif "text" in payload:
+            texts = [payload["text"]]
+            single = True
+        else:
+            raise ValueError("Body needs 'text' or 'texts'")
+
+        if not all(isinstance(t, str) for t in texts):
+            raise ValueError("Ticket texts must be strings")
+
+        return texts, single
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._error(404, "Not found")
+            return
+
+        start = time.perf_counter()
+
+        try:
+            texts, single = self._read_texts()
+        except ValueError as e:   # includes json.JSONDecodeError
+            self.metrics.incr("errors")
+            self._error(400, str(e))
+            return
+
+        try:
+            future = self.batcher.submit(texts)
+        except Overloaded as e:
+            self.metrics.incr("rejected")
+            self._error(503, str(e))
+            return
+
+        try:
+            tickets = future.result(timeout=REQUEST_TIMEOUT)
+        except Exception as e:
+            self.metrics.incr("errors")
+            self._error(500, f"Inference failed: {e}")
+            return
+
+        self.metrics.observe_request(time.perf_counter() - start, len(texts))
+        self._send_json(200, tickets[0] if single else {"tickets": tickets})
+
+
+# ======================================
+# SERVER
+# ======================================
+class InferenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128    # listen backlog for bursts of clients
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT,
+                batch_window_ms=DEFAULT_BATCH_WINDOW_MS,
+                max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+    """
+    Builds the HTTP server and starts the batcher and model warm-up.
+    Call serve_forever() on the result.
+    """
+    server = InferenceServer((host, port), InferenceHandler)
+    server.metrics = Metrics()
+    server.batcher = MicroBatcher(
+        server.metrics,
+        window=batch_window_ms / 1000,
+        max_batch_size=max_batch_size
+    )
+    server.ready = threading.Event()
+    server.load_error = None
+
+    def _load():
+        # Called here, not via warm_up(), so a failed load is seen
+        try:
+            get_artifacts()
+            warm_up_text_cleaning()
+        except Exception as e:
+            logger.exception("Model loading failed; not ready")
+            server.load_error = str(e)
+            return
+        server.ready.set()
+        logger.info("Models loaded; ready")
+
+    threading.Thread(target=_load, name="ready-check", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local ticket inference server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=DEFAULT_BATCH_WINDOW_MS,
+        help="how long the batcher waits for more requests"
+    )
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    server = make_server(
+        args.host, args.port, args.batch_window_ms, args.max_batch_size
+    )
+    print(f"Serving on http://{args.host}:{args.port} "
+          f"(batch window {args.batch_window_ms} ms, "
+          f"max batch {args.max_batch_size})", flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
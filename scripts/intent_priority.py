@@ -1,11 +1,20 @@
-URGENT_KEYWORDS = [
-    "urgent", "immediately", "asap", "critical",
-    "not working", "system down", "blocked", "unable to access"
-]
+import sys
+from pathlib import Path
+
+# Importable as scripts.intent_priority from the project root, or as
+# intent_priority from scripts/
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from scripts.keyword_rules import load_rules  # noqa: E402
+
+# Urgency keywords live in config/keyword_rules.json ("default" profile,
+# shared with scripts/inference_pipeline.py)
+RULES = load_rules("default")
 
 def detect_urgent_intent(text: str):
     """
     Returns True if urgent intent is detected
     """
-    text = text.lower()
-    return any(keyword in text for keyword in URGENT_KEYWORDS)
+    return RULES.is_urgent(text)
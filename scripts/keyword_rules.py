@@ -0,0 +1,102 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+# ======================================
+# CONFIG LOCATION
+# ======================================
+BASE_DIR = Path(__file__).resolve().parents[1]
+RULES_PATH = BASE_DIR / "config" / "keyword_rules.json"
+
+
+def _keyword_pattern(keyword: str) -> str:
+    # "system down" also matches "system   down"
+    return r"\s+".join(re.escape(w) for w in keyword.lower().split())
+
+
+def _compile(keywords):
+    """
+    One alternation for all keywords, whole words only, tried in the
+    given (precedence) order. The lookahead makes every start position
+    a candidate, but only one keyword is reported per position: the
+    first listed one that matches there. With "password" listed before
+    "password reset", "password reset" reports "password".
+    """
+    if not keywords:
+        return None
+
+    alternation = "|".join(_keyword_pattern(k) for k in keywords)
+    return re.compile(rf"(?=\b({alternation})\b)")
+
+
+# ======================================
+# RULE ENGINE
+# ======================================
+class KeywordRules:
+    """
+    Compiled keyword rules for category overrides and urgency detection.
+
+    category_rules is an ordered list of (label, keywords); when several
+    categories match, the earliest rule wins. Keywords only match whole
+    words, so "hr" does not fire on "three" nor "order" on "border".
+    """
+
+    def __init__(self, category_rules, urgency_keywords):
+        self.labels = [label for label, _ in category_rules]
+
+        # keyword -> rank of the first rule that lists it
+        self._rank = {}
+        for rank, (_, keywords) in enumerate(category_rules):
+            for k in keywords:
+                self._rank.setdefault(" ".join(k.lower().split()), rank)
+
+        # Insertion order is rank order, so each position reports its
+        # highest-precedence keyword
+        self._category_re = _compile(list(self._rank))
+        self._urgency_re = _compile(list(urgency_keywords))
+
+    @classmethod
+    def from_config(cls, profile: str, path=RULES_PATH):
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+
+        if profile not in config:
+            raise KeyError(f"Unknown keyword rule profile: {profile}")
+
+        section = config[profile]
+        rules = [
+            (rule["label"], rule["keywords"])
+            for rule in section.get("category_rules", [])
+        ]
+        return cls(rules, section.get("urgency_keywords", []))
+
+    def category(self, text: str):
+        """
+        Highest-precedence matching category label, or None.
+        """
+        if self._category_re is None:
+            return None
+
+        best = None
+        for m in self._category_re.finditer(text.lower()):
+            rank = self._rank[" ".join(m.group(1).split())]
+            if best is None or rank < best:
+                best = rank
+                if best == 0:
+                    break
+
+        return None if best is None else self.labels[best]
+
+    def is_urgent(self, text: str) -> bool:
+        if self._urgency_re is None:
+            return False
+        return self._urgency_re.search(text.lower()) is not None
+
+
+@lru_cache(maxsize=None)
+def load_rules(profile: str) -> KeywordRules:
+    """
+    Compiled rules for a profile in config/keyword_rules.json (cached).
+    """
+    return KeywordRules.from_config(profile)
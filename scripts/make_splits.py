@@ -1,21 +1,32 @@
-import pandas as pd
+import argparse
 from sklearn.model_selection import train_test_split
 from pathlib import Path
 
-data_path = Path(__file__).resolve().parents[1]/"data"/"cleaned"/"cleaned_dataset.csv"
-df = pd.read_csv(data_path)
+from clean_text import clean_text
+from dataset_io import MODEL_TEXT, SUFFIXES, has_model_text, read_dataset, write_dataset
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+data_path = BASE_DIR/"data"/"cleaned"/"cleaned_dataset.parquet"
+base = BASE_DIR/"data"/"splits"
+
+parser = argparse.ArgumentParser(description="Write train/val/test splits.")
+parser.add_argument("--input", type=Path, default=data_path)
+parser.add_argument("--format", choices=[s.lstrip(".") for s in SUFFIXES], default="parquet")
+args = parser.parse_args()
+
+df = read_dataset(args.input)
+
+# A stale (or CSV) model_text is recomputed by write_dataset
+if MODEL_TEXT in df and not has_model_text(args.input, clean_text):
+    df = df.drop(columns=[MODEL_TEXT])
 
 df = df.dropna(subset=["category","text_clean"])
 
 train_df, test_df = train_test_split(df,test_size=0.2,random_state=42,stratify=df["category"])
 train_df, val_df = train_test_split(train_df,test_size=0.1,random_state=42,stratify=train_df["category"])
 
-base = Path(__file__).resolve().parents[1]/"data"/"splits"
-base.mkdir(parents=True,exist_ok=True)
-
-train_df.to_csv(base/"train.csv",index=False)
-val_df.to_csv(base/"val.csv",index=False)
-test_df.to_csv(base/"test.csv",index=False)
+for name, split in (("train", train_df), ("val", val_df), ("test", test_df)):
+    write_dataset(split, base/f"{name}.{args.format}", cleaner=clean_text)
 
 print("Train:", train_df.shape)
 print("Val:", val_df.shape)
@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+# =====================================
+# IN-PROCESS LATENCY HISTOGRAMS
+# =====================================
+# Instrumentation hooks (timed / timer / observe) record durations into
+# fixed-bucket histograms shared by every thread in the process: the
+# inference pipeline stages and the scripts/db.py calls. Recording is a
+# bisect plus a few increments under a lock, so hooks can stay on in
+# production. pages/metrics.py shows them live; export_text() renders the
+# Prometheus text format for a local collector, either via the inference
+# server's /metrics/prometheus or a textfile written every few seconds
+# when TICKET_METRICS_FILE is set.
+
+# Bucket upper bounds in seconds: 10 µs .. ~42 s, x1.5 per bucket
+BUCKETS = tuple(1e-5 * 1.5 ** i for i in range(38))
+
+METRIC_NAME = "ticket_latency_seconds"
+TEXTFILE_PATH = os.environ.get("TICKET_METRICS_FILE")
+TEXTFILE_INTERVAL = 15   # seconds between textfile writes
+
+
+class LatencyHistogram:
+    """
+    Counts per latency bucket plus count/sum/max. Percentiles are
+    interpolated inside the bucket that holds them.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last = overflow
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(
+                    lower + (upper - lower) * (rank - seen) / n, self.max
+                )
+            seen += n
+
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": 1000 * self.sum / self.count if self.count else 0.0,
+            "p50_ms": 1000 * self.percentile(50),
+            "p95_ms": 1000 * self.percentile(95),
+            "p99_ms": 1000 * self.percentile(99),
+            "max_ms": 1000 * self.max,
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self.started = time.time()
+
+    def observe(self, name, seconds):
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = LatencyHistogram()
+            hist.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """
+        {name: summary} for every histogram, sorted by name.
+        """
+        with self._lock:
+            return {
+                name: hist.summary()
+                for name, hist in sorted(self._histograms.items())
+            }
+
+    def export_text(self):
+        """
+        Prometheus text exposition format (cumulative buckets).
+        """
+        lines = [
+            f"# HELP {METRIC_NAME} Latency of ticket inference stages "
+            "and database calls.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+
+        with self._lock:
+            for name, hist in sorted(self._histograms.items()):
+                label = f'stage="{name}"'
+                cumulative = 0
+                for bound, n in zip(hist.buckets, hist.counts):
+                    cumulative += n
+                    lines.append(
+                        f'{METRIC_NAME}_bucket{{{label},le="{bound:.6g}"}} '
+                        f"{cumulative}"
+                    )
+                lines.append(
+                    f'{METRIC_NAME}_bucket{{{label},le="+Inf"}} {hist.count}'
+                )
+                lines.append(f"{METRIC_NAME}_sum{{{label}}} {hist.sum:.9f}")
+                lines.append(f"{METRIC_NAME}_count{{{label}}} {hist.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+# =====================================
+# INSTRUMENTATION HOOKS
+# =====================================
+def observe(name, seconds):
+    metrics.observe(name, seconds)
+
+
+@contextmanager
+def timer(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """
+    Decorator recording each call's duration under `name`.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.observe(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+# =====================================
+# TEXTFILE EXPORT (LOCAL COLLECTOR)
+# =====================================
+def write_textfile(path):
+    """
+    Atomically writes export_text() to `path` (textfile collector style).
+    """
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(metrics.export_text())
+    os.replace(tmp, path)
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def start_textfile_exporter(path=TEXTFILE_PATH, interval=TEXTFILE_INTERVAL):
+    """
+    Rewrites the textfile every `interval` seconds in a daemon thread
+    (once per process). Does nothing when no path is configured.
+    """
+    global _exporter
+
+    if not path:
+        return None
+
+    with _exporter_lock:
+        if _exporter is None:
+            def _run():
+                while True:
+                    time.sleep(interval)
+                    try:
+                        write_textfile(path)
+                    except OSError:
+                        pass
+
+            _exporter = threading.Thread(
+                target=_run, name="metrics-textfile", daemon=True
+            )
+            _exporter.start()
+
+    return _exporter
@@ -0,0 +1,410 @@
+import argparse
+import copy
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score
+
+from scripts.clean_text import clean_text
+from scripts.compact_models import stage_compact
+from scripts.db import PENDING, fetch_closed_since
+from scripts.inference_pipeline import MODELS_DIR, VECTORIZER_FILES
+
+# ======================================
+# ONLINE MODEL UPDATES FROM CLOSED TICKETS
+# ======================================
+# A closed ticket's final category/priority is ground truth. Each run:
+#   1. harvests tickets closed since the checkpoint in <model dir>/feedback/
+#   2. continues training the current category/priority models on them
+#      (SGD steps starting from the published weights; vectorizer and
+#      label encoders stay fixed, so an update takes seconds)
+#   3. scores current and candidate models on a frozen holdout of closed
+#      tickets that is never trained on
+#   4. publishes the candidate only if no holdout accuracy drops by more
+#      than --tolerance: each model file is written to a temp file and
+#      swapped in with os.replace, the replaced files are archived, and
+#      the checkpoint moves last. models/compact/ (tfidf, if exported) is
+#      re-exported in the same step, and train_pipeline's manifest is
+#      marked as superseded so its next run republishes
+#
+# Usage (from the project root):
+#   python -m scripts.online_update
+#   python -m scripts.online_update --dry-run
+
+FEEDBACK_DIRNAME = "feedback"
+HOLDOUT_EVERY = 5       # every 5th closed ticket (by id) is held out
+MIN_HOLDOUT = 20        # closed tickets needed before the holdout is frozen
+MIN_BATCH = 10          # new training tickets needed for an update
+UPDATE_EPOCHS = 3
+LEARNING_RATE = 0.01    # constant SGD step size for updates
+ALPHA = 1e-5
+DEFAULT_TOLERANCE = 0.0
+
+COMPACT_DIRNAME = "compact"
+TRAINING_MANIFEST = "training_manifest.json"    # train_pipeline.MANIFEST_FILE
+
+MODEL_FILES = {
+    "category": ("category_model.pkl", "category_encoder.pkl", "hinge"),
+    "priority": ("priority_model.pkl", "priority_encoder.pkl", "log_loss"),
+}
+
+
+# ======================================
+# STATE (CHECKPOINT, HOLDOUT, HISTORY)
+# ======================================
+class FeedbackState:
+    """
+    <model dir>/feedback/state.json: checkpoint, version and update
+    history. holdout.csv next to it is the frozen validation set.
+    """
+
+    def __init__(self, model_dir):
+        self.dir = Path(model_dir) / FEEDBACK_DIRNAME
+        self.path = self.dir / "state.json"
+        self.holdout_path = self.dir / "holdout.csv"
+
+        self.data = {"checkpoint": None, "version": 0, "history": []}
+        if self.path.exists():
+            self.data = json.loads(self.path.read_text())
+
+    @property
+    def checkpoint(self):
+        cp = self.data["checkpoint"]
+        return tuple(cp) if cp else None
+
+    def load_holdout(self):
+        if not self.holdout_path.exists():
+            return None
+        return pd.read_csv(self.holdout_path, keep_default_na=False)
+
+    def save_holdout(self, df):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self.holdout_path, df.to_csv(index=False).encode())
+
+    def save(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(
+            self.path, json.dumps(self.data, indent=2).encode("utf-8")
+        )
+
+
+def _atomic_write(path, data: bytes):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+# ======================================
+# HARVEST
+# ======================================
+def harvest(after):
+    """
+    Closed tickets since the checkpoint as a DataFrame with lowercased
+    labels (tickets still PENDING classification are dropped), plus the
+    new (closed_at, id) checkpoint.
+    """
+    rows = fetch_closed_since(after)
+    df = pd.DataFrame(
+        rows, columns=["id", "text", "category", "priority", "closed_at"]
+    )
+    df = df[(df["category"] != PENDING) & df["category"].notna()
+            & df["priority"].notna()]
+
+    df["category"] = df["category"].str.strip().str.lower()
+    df["priority"] = df["priority"].str.strip().str.lower()
+    return df, ((rows[-1][4], rows[-1][0]) if rows else None)
+
+
+def known_labels(df, encoders):
+    """
+    Rows whose labels the encoders know (new classes cannot be added
+    incrementally).
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for head, encoder in encoders.items():
+        mask &= df[head].isin(encoder.classes_).values
+    return df[mask]
+
+
+# ======================================
+# MODEL UPDATE
+# ======================================
+def _as_sgd(model, loss):
+    """
+    An SGDClassifier that continues from `model`'s weights (LinearSVC,
+    LogisticRegression or an earlier SGD update).
+    """
+    sgd = SGDClassifier(
+        loss=loss,
+        alpha=ALPHA,
+        learning_rate="constant",
+        eta0=LEARNING_RATE,
+        random_state=42
+    )
+    sgd.classes_ = np.array(model.classes_)
+    sgd.coef_ = np.array(model.coef_, dtype=np.float64, order="C")
+    sgd.intercept_ = np.array(model.intercept_, dtype=np.float64)
+    return sgd
+
+
+def update_model(model, loss, X, y):
+    candidate = _as_sgd(copy.deepcopy(model), loss)
+    rng = np.random.default_rng(42)
+
+    for _ in range(UPDATE_EPOCHS):
+        order = rng.permutation(X.shape[0])
+        candidate.partial_fit(X[order], y[order], classes=candidate.classes_)
+
+    return candidate
+
+
+def evaluate(models, encoders, X, df):
+    return {
+        head: accuracy_score(
+            encoders[head].transform(df[head]), models[head].predict(X)
+        )
+        for head in models
+    }
+
+
+# ======================================
+# PUBLISH
+# ======================================
+def _stage_bytes(data: bytes, target):
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp
+
+
+def _superseded_manifest(path, version):
+    """
+    train_pipeline's manifest with its stage keys moved aside: the files
+    no longer are what those keys built, so its next publish must not be
+    skipped.
+    """
+    manifest = json.loads(path.read_text())
+    if manifest.get("keys") is not None:
+        manifest["base_keys"] = manifest["keys"]
+    manifest["keys"] = None
+    manifest["online_update"] = {
+        "version": version,
+        "published_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    return json.dumps(manifest, indent=2).encode("utf-8")
+
+
+def publish(models, model_dir, state, vectorizer=None, encoders=None):
+    """
+    Archives the current model files, then swaps in the new ones together
+    with a re-exported compact copy (when model_dir has one and the
+    vectorizer/encoders are given) and the superseded training manifest.
+    """
+    model_dir = Path(model_dir)
+    version = state.data["version"] + 1
+    archive = state.dir / "archive" / f"v{version - 1:04d}"
+    archive.mkdir(parents=True, exist_ok=True)
+
+    staged = []
+    for head, model in models.items():
+        target = model_dir / MODEL_FILES[head][0]
+        if target.exists():
+            (archive / target.name).write_bytes(target.read_bytes())
+
+        fd, tmp = tempfile.mkstemp(dir=model_dir, prefix=f".{target.name}.")
+        with os.fdopen(fd, "wb") as f:
+            joblib.dump(model, f)
+            f.flush()
+            os.fsync(f.fileno())
+        staged.append((tmp, target))
+
+    compact_dir = model_dir / COMPACT_DIRNAME
+    manifest = model_dir / TRAINING_MANIFEST
+    export_dir = None
+    try:
+        # ---- COMPACT COPY (memory-mapped serving format) ----
+        if compact_dir.is_dir() and vectorizer is not None and encoders:
+            shutil.copytree(compact_dir, archive / COMPACT_DIRNAME,
+                            dirs_exist_ok=True)
+            export_dir, files = stage_compact(
+                vectorizer, models["category"], models["priority"],
+                encoders["category"], encoders["priority"], compact_dir
+            )
+            staged.extend(files)
+
+        # ---- TRAINING MANIFEST ----
+        if manifest.exists():
+            (archive / manifest.name).write_bytes(manifest.read_bytes())
+            data = _superseded_manifest(manifest, version)
+            staged.append((_stage_bytes(data, manifest), manifest))
+    except BaseException:
+        for tmp, _ in staged:
+            Path(tmp).unlink(missing_ok=True)
+        if export_dir is not None:
+            shutil.rmtree(export_dir, ignore_errors=True)
+        raise
+
+    # Every file is fully written before any is swapped in
+    for tmp, target in staged:
+        os.replace(tmp, target)
+    if export_dir is not None:
+        export_dir.rmdir()
+
+    return version
+
+
+# ======================================
+# ONE UPDATE RUN
+# ======================================
+def run_update(model_dir=MODELS_DIR, feature_mode="tfidf",
+               tolerance=DEFAULT_TOLERANCE, dry_run=False):
+    """
+    Returns a summary dict; summary["published"] tells whether new
+    artifacts went live.
+    """
+    start = time.perf_counter()
+    model_dir = Path(model_dir)
+    state = FeedbackState(model_dir)
+
+    vectorizer = joblib.load(model_dir / VECTORIZER_FILES[feature_mode])
+    models, encoders = {}, {}
+    for head, (model_file, encoder_file, _) in MODEL_FILES.items():
+        models[head] = joblib.load(model_dir / model_file)
+        encoders[head] = joblib.load(model_dir / encoder_file)
+
+    # ---- HOLDOUT (FROZEN ON FIRST RUN) ----
+    holdout = state.load_holdout()
+    if holdout is None:
+        closed, _ = harvest(None)
+        closed = known_labels(closed, encoders)
+        holdout = closed[closed["id"] % HOLDOUT_EVERY == 0]
+
+        if len(holdout) < MIN_HOLDOUT:
+            return {
+                "published": False,
+                "reason": f"only {len(holdout)} holdout tickets "
+                          f"(need {MIN_HOLDOUT}); close more tickets first",
+            }
+        if not dry_run:
+            state.save_holdout(holdout[["id", "text", "category", "priority"]])
+
+    holdout_ids = set(holdout["id"])
+
+    # ---- HARVEST SINCE CHECKPOINT ----
+    new, checkpoint = harvest(state.checkpoint)
+    harvested = len(new)
+    new = known_labels(new[~new["id"].isin(holdout_ids)], encoders)
+
+    summary = {
+        "published": False,
+        "harvested": harvested,
+        "trained_on": len(new),
+        "holdout": len(holdout),
+    }
+
+    if len(new) < MIN_BATCH:
+        summary["reason"] = f"only {len(new)} new tickets (need {MIN_BATCH})"
+        return summary
+
+    # ---- UPDATE ----
+    X = vectorizer.transform([clean_text(t) for t in new["text"]])
+    candidates = {
+        head: update_model(
+            models[head], MODEL_FILES[head][2],
+            X, encoders[head].transform(new[head])
+        )
+        for head in models
+    }
+
+    # ---- VALIDATE ----
+    X_holdout = vectorizer.transform([clean_text(t) for t in holdout["text"]])
+    before = evaluate(models, encoders, X_holdout, holdout)
+    after = evaluate(candidates, encoders, X_holdout, holdout)
+    summary.update(before=before, after=after)
+
+    regressed = [h for h in before if after[h] < before[h] - tolerance]
+    if regressed:
+        summary["reason"] = f"holdout accuracy dropped for {', '.join(regressed)}"
+        return summary
+
+    if dry_run:
+        summary["reason"] = "dry run"
+        return summary
+
+    # ---- PUBLISH, THEN MOVE THE CHECKPOINT ----
+    version = publish(candidates, model_dir, state, vectorizer, encoders)
+    summary.update(published=True, version=version)
+
+    state.data["version"] = version
+    state.data["checkpoint"] = list(checkpoint)
+    state.data["history"].append({
+        "version": version,
+        "published_at": datetime.now().isoformat(timespec="seconds"),
+        "trained_on": len(new),
+        "before": before,
+        "after": after,
+    })
+    state.save()
+
+    summary["seconds"] = round(time.perf_counter() - start, 2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Update the models from closed tickets."
+    )
+    parser.add_argument("--model-dir", type=Path, default=MODELS_DIR)
+    parser.add_argument(
+        "--features", choices=sorted(VECTORIZER_FILES), default="tfidf"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help="allowed holdout accuracy drop per model"
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    model_dir = args.model_dir
+    if args.features != "tfidf" and args.model_dir == MODELS_DIR:
+        model_dir = MODELS_DIR / args.features
+
+    summary = run_update(model_dir, args.features, args.tolerance, args.dry_run)
+
+    for key in ("harvested", "trained_on", "holdout"):
+        if key in summary:
+            print(f"{key:>12}: {summary[key]}")
+    for head in summary.get("before", {}):
+        print(f"{head:>12}: {summary['before'][head]:.4f} -> "
+              f"{summary['after'][head]:.4f}")
+
+    if summary["published"]:
+        print(f"✅ Published v{summary['version']:04d} to {model_dir} "
+              f"in {summary['seconds']}s")
+    else:
+        print(f"⏭ Not published: {summary['reason']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
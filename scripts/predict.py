@@ -1,25 +1,16 @@
-import joblib
+import sys
 from pathlib import Path
-from clean_text import clean_text
 
 # ======================================
 # BASE PATH
 # ======================================
+# Runs as `python predict.py` from scripts/ or `python -m scripts.predict`
 BASE_DIR = Path(__file__).resolve().parents[1]
-MODEL_DIR = BASE_DIR / "models"
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
 
-# ======================================
-# LOAD MODELS & ENCODERS
-# ======================================
-vectorizer = joblib.load(MODEL_DIR / "tfidf_vectorizer.pkl")
-
-category_model = joblib.load(MODEL_DIR / "category_model.pkl")
-priority_model = joblib.load(MODEL_DIR / "priority_model.pkl")
+from scripts.inference_pipeline import get_artifacts, get_pipeline  # noqa: E402
 
-category_encoder = joblib.load(MODEL_DIR / "category_encoder.pkl")
-priority_encoder = joblib.load(MODEL_DIR / "priority_encoder.pkl")
-
-print("Models & vectorizer loaded successfully.")
 
 # ======================================
 # PREDICTION FUNCTION
@@ -27,46 +18,32 @@ print("Models & vectorizer loaded successfully.")
 def predict_ticket(text: str):
     """
     Predicts category and priority for a ticket description
+    (shared pipeline in scripts/inference_pipeline.py)
     """
+    batch = get_pipeline().run([text], until="urgency")
 
-    # 1️⃣ Clean input text (same as training)
-    cleaned = clean_text(text)
-
-    if not cleaned.strip():
+    if not batch.valid[0]:
         return {
             "original_text": text,
-            "cleaned_text": cleaned,
+            "cleaned_text": batch.cleaned[0],
             "predicted_category": "miscellaneous",
             "predicted_priority": "low"
         }
 
-    # 2️⃣ Vectorize
-    X = vectorizer.transform([cleaned])
-
-    # 3️⃣ CATEGORY prediction (with safety fallback)
-    scores = category_model.decision_function(X)
-
-    if scores.max() < 0.2:
-        category = "miscellaneous"
-    else:
-        cat_label = category_model.predict(X)
-        category = category_encoder.inverse_transform(cat_label)[0]
-
-    # 4️⃣ PRIORITY prediction
-    pri_label = priority_model.predict(X)
-    priority = priority_encoder.inverse_transform(pri_label)[0]
-
     return {
         "original_text": text,
-        "cleaned_text": cleaned,
-        "predicted_category": category,
-        "predicted_priority": priority
+        "cleaned_text": batch.cleaned[0],
+        "predicted_category": batch.category[0],
+        "predicted_priority": batch.priority[0]
     }
 
 # ======================================
 # CLI TEST
 # ======================================
 if __name__ == "__main__":
+    get_artifacts()
+    print("Models & vectorizer loaded successfully.")
+
     print("\n=== AI Ticket Prediction ===")
     user_text = input("Enter ticket description: ")
 
@@ -1,3 +1,4 @@
+import argparse
 import re
 import pandas as pd
 from html import unescape
@@ -5,8 +6,22 @@ import spacy
 from pathlib import Path
 from tqdm import tqdm
 
-nlp = spacy.load("en_core_web_sm")
-tqdm.pandas()
+from clean_text import clean_text
+from dataset_io import DatasetWriter, read_dataset
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DATA_PATH = BASE_DIR / "data" / "raw" / "final_dataset_utf8.csv"
+OUTPUT_PATH = BASE_DIR / "data" / "cleaned" / "cleaned_dataset.parquet"
+DIST_PATH = BASE_DIR / "data" / "cleaned" / "category_distribution.csv"
+
+# Only lemmas and stop-word flags are used: the rule-based lemmatizer
+# needs tok2vec + tagger + attribute_ruler, so just the parser and NER
+# are switched off
+DISABLED_COMPONENTS = ["parser", "ner"]
+
+CHUNK_SIZE = 5000       # CSV rows read/written at a time
+BATCH_SIZE = 256        # texts per nlp.pipe batch
+N_PROCESS = 1           # nlp.pipe worker processes
 
 # Map inconsistent category names
 CATEGORY_MAP = {
@@ -33,8 +48,8 @@ def normalize_category(cat):
     if not isinstance(cat, str):
         return None
 
-    cat = cat.strip().lower()   
-    return CATEGORY_MAP.get(cat, cat)  
+    cat = cat.strip().lower()
+    return CATEGORY_MAP.get(cat, cat)
 
 
 def mask_pii(text):
@@ -45,33 +60,95 @@ def mask_pii(text):
     text = re.sub(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', '<IP>', text)
     return text
 
-def clean_text(text):
+def prepare_text(text):
+    """
+    Regex part of the cleaning, before spaCy
+    """
     if not isinstance(text, str):
         return ""
     text = unescape(text).lower()
     text = text.replace("\r"," ").replace("\t"," ")
     text = re.sub(r"[^a-z\s]", " ", text)
-    text = mask_pii(text)
-    doc = nlp(text)
+    return mask_pii(text)
+
+def lemmatize(doc):
     tokens = [t.lemma_ for t in doc if not t.is_stop]
     return re.sub(r'\s+',' '," ".join(tokens)).strip()
 
-data_path = Path(__file__).resolve().parents[1] / "data" / "raw" / "final_dataset_utf8.csv"
-df = pd.read_csv(data_path)
-
-df["category"] = df["category"].apply(normalize_category)
-df["text_clean"] = df["text"].progress_apply(clean_text)
-
-df = df.dropna(subset=["category", "text_clean"])
-df = df.drop_duplicates()
-
-output_path = Path(__file__).resolve().parents[1]/"data"/"cleaned"/"cleaned_dataset.csv"
-output_path.parent.mkdir(parents=True,exist_ok=True)
-df.to_csv(output_path,index=False)
-
-# Save distribution
-dist_path = Path(__file__).resolve().parents[1]/"data"/"cleaned"/"category_distribution.csv"
-df["category"].value_counts().to_csv(dist_path)
-
-print("Saved cleaned dataset to:", output_path)
-print("Category distribution saved to:", dist_path)
+def clean_texts(nlp, texts, batch_size=BATCH_SIZE, n_process=N_PROCESS):
+    """
+    Streams texts through nlp.pipe; yields cleaned strings in order
+    """
+    docs = nlp.pipe(
+        (prepare_text(t) for t in texts),
+        batch_size=batch_size,
+        n_process=n_process
+    )
+    for doc in docs:
+        yield lemmatize(doc)
+
+
+def preprocess(data_path=DATA_PATH, output_path=OUTPUT_PATH,
+               chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE,
+               n_process=N_PROCESS):
+    """
+    Reads the raw CSV in chunks, cleans each chunk with nlp.pipe and
+    appends it to output_path (.parquet, with model_text precomputed by
+    clean_text, or .csv). Rows with no category and duplicate rows
+    (across the whole file, first one kept) are dropped before spaCy runs.
+    """
+    nlp = spacy.load("en_core_web_sm", disable=DISABLED_COMPONENTS)
+
+    seen = set()
+
+    with DatasetWriter(output_path, cleaner=clean_text) as writer, \
+            tqdm(unit="rows") as progress:
+        for chunk in pd.read_csv(data_path, chunksize=chunk_size):
+            progress.update(len(chunk))
+
+            chunk["category"] = chunk["category"].apply(normalize_category)
+            chunk = chunk.dropna(subset=["category"])
+
+            # text_clean depends only on text, so deduplicating on the raw
+            # columns drops the same rows as deduplicating afterwards
+            row_hashes = pd.util.hash_pandas_object(chunk, index=False)
+            keep = ~row_hashes.duplicated().values & [
+                h not in seen for h in row_hashes
+            ]
+            seen.update(row_hashes[keep])
+            chunk = chunk[keep]
+
+            chunk = chunk.assign(text_clean=list(clean_texts(
+                nlp, chunk["text"], batch_size=batch_size, n_process=n_process
+            )))
+
+            writer.write(chunk)
+
+    return writer.rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean the raw ticket dataset.")
+    parser.add_argument("--input", type=Path, default=DATA_PATH)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument(
+        "--n-process", type=int, default=N_PROCESS,
+        help="spaCy worker processes (-1 = all cores)"
+    )
+    args = parser.parse_args()
+
+    written = preprocess(
+        args.input, args.output,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        n_process=args.n_process
+    )
+
+    # Save distribution
+    categories = read_dataset(args.output, ["category"])["category"]
+    categories.value_counts().to_csv(DIST_PATH)
+
+    print(f"Saved {written} cleaned rows to:", args.output)
+    print("Category distribution saved to:", DIST_PATH)
@@ -0,0 +1,46 @@
+import argparse
+import sys
+
+from scripts.db import check_counts, create_table, rebuild_counts
+
+# =====================================
+# TICKET COUNTERS CHECK / REBUILD
+# =====================================
+# Usage (from the project root):
+#   python -m scripts.rebuild_counts           # check only
+#   python -m scripts.rebuild_counts --rebuild # recompute from tickets
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check or rebuild the ticket_counts table."
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="recompute ticket_counts from tickets in one grouped pass"
+    )
+    args = parser.parse_args()
+
+    create_table()
+
+    if args.rebuild:
+        rebuild_counts()
+        print("✅ ticket_counts rebuilt")
+
+    mismatches = check_counts()
+
+    if not mismatches:
+        print("✅ ticket_counts is consistent with tickets")
+        return 0
+
+    print(f"❌ {len(mismatches)} counter rows disagree with tickets:")
+    for status, priority, category, stored, actual in mismatches:
+        print(f"  {status!r:14} {priority!r:10} {category!r:24} "
+              f"stored={stored} actual={actual}")
+    print("Run with --rebuild to fix.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
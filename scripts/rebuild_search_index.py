@@ -0,0 +1,41 @@
+import argparse
+import sys
+
+from scripts.db import check_search_index, create_table, rebuild_search_index
+
+# =====================================
+# SEARCH INDEX CHECK / REBUILD
+# =====================================
+# Usage (from the project root):
+#   python -m scripts.rebuild_search_index           # check only
+#   python -m scripts.rebuild_search_index --rebuild # reindex from tickets
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check or rebuild the tickets_fts search index."
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="reindex tickets_fts from tickets and merge it into one segment"
+    )
+    args = parser.parse_args()
+
+    create_table()
+
+    if args.rebuild:
+        rebuild_search_index()
+        print("✅ tickets_fts rebuilt")
+
+    if check_search_index():
+        print("✅ tickets_fts is consistent with tickets")
+        return 0
+
+    print("❌ tickets_fts is out of step with tickets")
+    print("Run with --rebuild to fix.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+import streamlit as st
+
+from scripts.db import SEARCH_MAX_RANKED, search_tickets
+
+# =====================================
+# FULL-TEXT SEARCH BOX (BEST MATCHES FIRST)
+# =====================================
+# Shared by the active and closed ticket pages. Session state and widget
+# keys are prefixed with the view, so each page keeps its own query and
+# result offset.
+SEARCH_PAGE_SIZE = 20
+
+
+def render_search(view):
+    """
+    Search box for the "active" or "closed" view. While a query is
+    entered it shows one page of ranked results and stops the page
+    script; otherwise it returns and the page renders as usual.
+    """
+    query_key = f"{view}_search"
+    offset_key = f"{view}_search_offset"
+
+    search = st.text_input(
+        f"🔍 Search {view} tickets",
+        placeholder="Words from the title or description, e.g. vpn access denied",
+    ).strip()
+
+    if not search:
+        return
+
+    if st.session_state.get(query_key) != search:
+        st.session_state[query_key] = search
+        st.session_state[offset_key] = 0
+
+    offset = st.session_state[offset_key]
+    results, has_more, truncated = search_tickets(
+        search, view, limit=SEARCH_PAGE_SIZE, offset=offset
+    )
+
+    if not results:
+        st.info(f"No {view} tickets match your search.")
+        st.stop()
+
+    st.caption(f"Best matches {offset + 1}–{offset + len(results)}")
+
+    if truncated:
+        st.warning(
+            f"More than {SEARCH_MAX_RANKED:,} tickets match; only the newest "
+            f"{SEARCH_MAX_RANKED:,} are ranked. Add words to narrow the search."
+        )
+
+    # Every closed ticket has the same status, so it is only shown for active
+    for tid, title, cat, pr, status, created_at, snippet in results:
+        status_part = f" | Status: `{status}`" if view != "closed" else ""
+        st.markdown(
+            f"""
+            **🎫 Ticket #{tid} — {title}**  
+            Category: `{cat}` | Priority: `{pr}`{status_part}  
+            Created: {created_at}
+            """
+        )
+        st.markdown(snippet)
+        st.divider()
+
+    s1, s2, _ = st.columns([1, 1, 6])
+
+    if s1.button("⬅️ Previous", disabled=offset == 0, key=f"{view}_search_prev"):
+        st.session_state[offset_key] -= SEARCH_PAGE_SIZE
+        st.rerun()
+
+    if s2.button("Next ➡️", disabled=not has_more, key=f"{view}_search_next"):
+        st.session_state[offset_key] += SEARCH_PAGE_SIZE
+        st.rerun()
+
+    st.stop()
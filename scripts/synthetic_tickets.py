@@ -0,0 +1,129 @@
+import random
+from bisect import bisect
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.dataset_io import SUFFIXES, read_dataset
+
+# ======================================
+# SYNTHETIC TICKET CORPUS
+# ======================================
+# Generates realistic-looking ticket text of any volume from the
+# vocabulary of data/splits/ (Parquet or CSV): a word-bigram chain learned from the
+# split texts, with sentence lengths, categories and priorities drawn
+# from the same files. Output is deterministic for a given seed.
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+SPLITS_DIR = BASE_DIR / "data" / "splits"
+
+STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+STATUS_WEIGHTS = [0.4, 0.2, 0.15, 0.25]
+MAX_AGE_DAYS = 30
+
+_END = None   # end-of-text marker in the bigram chain
+
+
+class _Sampler:
+    """
+    Weighted choice over a fixed set of values (cumulative weights).
+    """
+
+    def __init__(self, counts):
+        self.values = list(counts)
+        self.cum = list(accumulate(counts.values()))
+
+    def __call__(self, rng):
+        return self.values[bisect(self.cum, rng.random() * self.cum[-1])]
+
+
+class SyntheticTicketGenerator:
+    def __init__(self, texts, categories, priorities, seed=0):
+        chain = defaultdict(Counter)
+        starts = Counter()
+        lengths = Counter()
+
+        for text in texts:
+            words = str(text).split()
+            if not words:
+                continue
+            starts[words[0]] += 1
+            lengths[len(words)] += 1
+            for a, b in zip(words, words[1:]):
+                chain[a][b] += 1
+            chain[words[-1]][_END] += 1
+
+        self._start = _Sampler(starts)
+        self._next = {word: _Sampler(c) for word, c in chain.items()}
+        self._length = _Sampler(lengths)
+        self._category = _Sampler(Counter(categories))
+        self._priority = _Sampler(Counter(priorities))
+        self.seed = seed
+
+    @classmethod
+    def from_splits(cls, splits_dir=SPLITS_DIR, seed=0):
+        # One file per split, in the preferred format when several exist
+        splits_dir = Path(splits_dir)
+        names = sorted({
+            p.stem for p in splits_dir.glob("*") if p.suffix in SUFFIXES
+        })
+        frames = [
+            read_dataset(
+                splits_dir / f"{name}{SUFFIXES[0]}",
+                ["text", "category", "priority"]
+            )
+            for name in names
+        ]
+        if not frames:
+            raise FileNotFoundError(f"No split files in {splits_dir}")
+        df = pd.concat(frames, ignore_index=True).dropna(subset=["text"])
+        return cls(
+            df["text"],
+            df["category"].astype(str).str.strip().str.lower(),
+            df["priority"].astype(str).str.strip().str.lower(),
+            seed=seed,
+        )
+
+    def _text(self, rng):
+        target = self._length(rng)
+        words = [self._start(rng)]
+
+        while len(words) < target:
+            nxt = self._next[words[-1]](rng)
+            # Restart from a new opening word at end-of-text so long
+            # tickets read as several sentences
+            words.append(self._start(rng) if nxt is _END else nxt)
+
+        return " ".join(words)
+
+    def texts(self, n, seed=None):
+        """
+        Yields n ticket descriptions.
+        """
+        rng = random.Random(self.seed if seed is None else seed)
+        for _ in range(n):
+            yield self._text(rng)
+
+    def tickets(self, n, seed=None, now=None):
+        """
+        Yields n (title, description, category, priority, status,
+        created_at) rows for db.insert_tickets_many. created_at is spread
+        over the last MAX_AGE_DAYS days (UTC, like CURRENT_TIMESTAMP).
+        """
+        rng = random.Random(self.seed if seed is None else seed)
+        now = now or datetime.now(timezone.utc)
+
+        for _ in range(n):
+            category = self._category(rng)
+            age = timedelta(seconds=rng.random() * MAX_AGE_DAYS * 86400)
+            yield (
+                f"{category.capitalize()} Issue",
+                self._text(rng),
+                category,
+                self._priority(rng).capitalize(),
+                rng.choices(STATUSES, STATUS_WEIGHTS)[0],
+                (now - age).strftime("%Y-%m-%d %H:%M:%S"),
+            )
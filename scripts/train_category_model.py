@@ -1,134 +1,46 @@
-import re
-from html import unescape
+import argparse
 from pathlib import Path
 
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.svm import LinearSVC
-from sklearn.metrics import classification_report, accuracy_score
-from sklearn.preprocessing import LabelEncoder
-import joblib
+from train_pipeline import DATA_PATH, MODEL_DIR, run_pipeline
 
 
 # =====================================================
-# PATH SETUP
+# CATEGORY MODEL TRAINING
 # =====================================================
-BASE_DIR = Path(__file__).resolve().parents[1]
-DATA_PATH = BASE_DIR / "data" / "cleaned" / "final_dataset_cleaned.csv"
-MODEL_DIR = BASE_DIR / "models"
+# Kept as an entry point, but runs the staged pipeline (train_pipeline.py)
+# instead of fitting its own TF-IDF: the category model is always
+# published together with the vectorizer and priority model it shares,
+# and the cached clean/vectorize/priority stages are reused.
+#
+# Usage (from the scripts/ folder):
+#   python train_category_model.py --data ../data/cleaned/cleaned_dataset.csv
 
-MODEL_DIR.mkdir(exist_ok=True)
-
-
-# =====================================================
-# TEXT CLEANING FUNCTION (DEPLOYMENT SAFE)
-# =====================================================
-def clean_text(text: str) -> str:
-    if not isinstance(text, str):
-        return ""
-
-    # Decode HTML & lowercase
-    text = unescape(text).lower()
-
-    # Remove emails, phone numbers, IPs
-    text = re.sub(r"\b[\w\.-]+@[\w\.-]+\.\w+\b", " ", text)
-    text = re.sub(r"\b\d{10}\b", " ", text)
-    text = re.sub(r"\b(?:\d{1,3}\.){3}\d{1,3}\b", " ", text)
-
-    # Remove special characters
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-
-    return text
-
-
-# =====================================================
-# LOAD DATASET
-# =====================================================
-print("Loading dataset...")
-df = pd.read_csv(DATA_PATH)
-print("Dataset shape:", df.shape)
-
-if "SNO" in df.columns:
-    df.drop(columns=["SNO"], inplace=True)
-
-
-# =====================================================
-# CLEAN TEXT
-# =====================================================
-df["clean_text"] = df["text"].apply(clean_text)
-
-
-# =====================================================
-# ENCODE CATEGORY LABELS
-# =====================================================
-label_encoder = LabelEncoder()
-df["category_encoded"] = label_encoder.fit_transform(df["category"])
-
-print("\nCategory mapping:")
-for idx, label in enumerate(label_encoder.classes_):
-    print(f"{idx} → {label}")
-
-
-# =====================================================
-# TRAIN–TEST SPLIT
-# =====================================================
-X = df["clean_text"]
-y = df["category_encoded"]
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X,
-    y,
-    test_size=0.2,
-    random_state=42,
-    stratify=y
-)
-
-
-# =====================================================
-# TF-IDF VECTORIZATION
-# =====================================================
-vectorizer = TfidfVectorizer(
-    ngram_range=(1, 2),
-    min_df=3,
-    max_df=0.9,
-    stop_words="english",
-    sublinear_tf=True
-)
-
-X_train_vec = vectorizer.fit_transform(X_train)
-X_test_vec = vectorizer.transform(X_test)
-
-
-# =====================================================
-# TRAIN LINEAR SVM
-# =====================================================
-model = LinearSVC(C=1.0)
-model.fit(X_train_vec, y_train)
-
-
-# =====================================================
-# EVALUATION
-# =====================================================
-y_pred = model.predict(X_test_vec)
-
-print("\nAccuracy:", accuracy_score(y_test, y_pred))
-print("\nClassification Report:")
-print(
-    classification_report(
-        y_test,
-        y_pred,
-        target_names=label_encoder.classes_
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the category model.")
+    parser.add_argument("--data", type=Path, default=DATA_PATH)
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument(
+        "--allow-new-labels", action="store_true",
+        help="publish even if the labels differ from the published models"
     )
-)
-
-
-# =====================================================
-# SAVE MODELS (DEPLOYMENT-STANDARD NAMES)
-# =====================================================
-joblib.dump(model, MODEL_DIR / "category_model.pkl")
-joblib.dump(vectorizer, MODEL_DIR / "tfidf_vectorizer.pkl")
-joblib.dump(label_encoder, MODEL_DIR / "category_encoder.pkl")
-
-print("\n✅ Category model training completed successfully")
+    args = parser.parse_args()
+
+    try:
+        pipeline, published = run_pipeline(
+            args.data, "tfidf", args.model_dir,
+            allow_new_labels=args.allow_new_labels
+        )
+    except RuntimeError as e:
+        print(f"\n❌ {e}")
+        raise SystemExit(1)
+
+    if "evaluate" in pipeline.status:
+        results = pipeline.output("evaluate")
+        print("\nAccuracy:", results["category_accuracy"])
+        print("\nClassification Report:")
+        print(results["category_report"])
+
+    if published:
+        print("\n✅ Category model training completed successfully")
+    else:
+        print(f"\n⏭ {args.model_dir} is already up to date")
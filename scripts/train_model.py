@@ -1,112 +1,584 @@
+import argparse
+import copy
+import json
 import pickle
-import pandas as pd
+import tempfile
+from collections import Counter
+
+import joblib
+import numpy as np
 from pathlib import Path
 
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import (
+    HashingVectorizer,
+    TfidfTransformer,
+    TfidfVectorizer,
+)
+from sklearn.pipeline import make_pipeline
 from sklearn.svm import LinearSVC
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score, classification_report
 
 from clean_text import clean_text
+from dataset_io import (
+    MODEL_TEXT,
+    DatasetWriter,
+    has_model_text,
+    iter_dataset,
+    read_dataset,
+)
 
 
 # ==============================
 # PATHS
 # ==============================
 BASE_DIR = Path(__file__).resolve().parents[1]
-DATA_PATH = BASE_DIR / "data" / "cleaned" / "final_dataset_cleaned.csv"
+DATA_PATH = BASE_DIR / "data" / "cleaned" / "cleaned_dataset.parquet"
 MODEL_DIR = BASE_DIR / "models"
-MODEL_DIR.mkdir(exist_ok=True)
+# SGD models from --streaming; kept apart from the batch models and
+# served by pointing TICKET_MODELS_DIR here (same layout as models/)
+STREAMING_MODEL_DIR = MODEL_DIR / "streaming"
+TRAINING_CONFIG_PATH = BASE_DIR / "config" / "training.json"
 
 
 # ==============================
-# LOAD DATA
+# FEATURE MODES
 # ==============================
-df = pd.read_csv(DATA_PATH)
+# tfidf   : TfidfVectorizer with a fitted 30k-term vocabulary
+#           -> models/tfidf_vectorizer.pkl
+# hashing : stateless HashingVectorizer + fitted IDF vector, no vocabulary
+#           -> models/hashing/hashing_vectorizer.pkl
+FEATURE_MODES = ("tfidf", "hashing")
+HASHING_N_FEATURES = 2 ** 16
+
+VECTORIZER_FILES = {
+    "tfidf": "tfidf_vectorizer.pkl",
+    "hashing": "hashing_vectorizer.pkl",
+}
 
-df["text_clean"] = df["text"].astype(str).apply(clean_text)
-df["category"] = df["category"].astype(str).str.strip().str.lower()
-df["priority"] = df["priority"].astype(str).str.strip().str.lower()
+
+def model_dir_for(mode, model_dir=MODEL_DIR):
+    return Path(model_dir) if mode == "tfidf" else Path(model_dir) / mode
 
 
 # ==============================
-# LABEL ENCODING
+# HYPERPARAMETERS
 # ==============================
-category_encoder = LabelEncoder()
-priority_encoder = LabelEncoder()
+# Per feature mode. config/training.json (written by tune_model.py)
+# overrides any of them; without it training uses these defaults.
+DEFAULT_PARAMS = {
+    "tfidf": {
+        "vectorizer": {
+            "max_features": 30000,
+            "ngram_range": [1, 2],
+            "min_df": 1,
+            "sublinear_tf": True,
+        },
+        "category": {"C": 1.0},
+        "priority": {"C": 1.0},
+    },
+    "hashing": {
+        "vectorizer": {"ngram_range": [1, 2], "sublinear_tf": True},
+        "category": {"C": 1.0},
+        "priority": {"C": 1.0},
+    },
+}
+
+
+def load_params(mode, path=TRAINING_CONFIG_PATH):
+    """
+    DEFAULT_PARAMS[mode] updated with the mode's section of the config.
+    """
+    params = copy.deepcopy(DEFAULT_PARAMS[mode])
+    path = Path(path)
+    if path.exists():
+        section = json.loads(path.read_text()).get(mode, {})
+        for part in params:
+            params[part].update(section.get(part, {}))
+    return params
+
+
+def build_vectorizer(mode, params=None):
+    params = params or DEFAULT_PARAMS[mode]["vectorizer"]
 
-y_category = category_encoder.fit_transform(df["category"])
-y_priority = priority_encoder.fit_transform(df["priority"])
+    if mode == "tfidf":
+        return TfidfVectorizer(
+            max_features=params["max_features"],
+            ngram_range=tuple(params["ngram_range"]),
+            min_df=params["min_df"],
+            stop_words="english",
+            sublinear_tf=params["sublinear_tf"]
+        )
 
-pickle.dump(category_encoder, open(MODEL_DIR / "category_encoder.pkl", "wb"))
-pickle.dump(priority_encoder, open(MODEL_DIR / "priority_encoder.pkl", "wb"))
+    if mode == "hashing":
+        # Raw counts from the hashing step; tf-idf scaling + l2 norm after
+        return make_pipeline(
+            HashingVectorizer(
+                n_features=HASHING_N_FEATURES,
+                ngram_range=tuple(params["ngram_range"]),
+                stop_words="english",
+                alternate_sign=False,
+                norm=None
+            ),
+            TfidfTransformer(sublinear_tf=params["sublinear_tf"])
+        )
+
+    raise ValueError(f"Unknown feature mode: {mode}")
+
+
+def build_category_model(params=None):
+    return LinearSVC(class_weight="balanced", **(params or {}))
+
+
+def build_priority_model(params=None):
+    return LogisticRegression(
+        max_iter=1000,
+        class_weight="balanced",
+        n_jobs=-1,
+        **(params or {})
+    )
 
 
 # ==============================
-# TF-IDF (ONE VECTOR SPACE)
+# LOAD DATA
 # ==============================
-vectorizer = TfidfVectorizer(
-    max_features=30000,
-    ngram_range=(1, 2),
-    stop_words="english",
-    sublinear_tf=True
-)
+def training_columns(path):
+    """
+    The columns training reads: the precomputed model_text replaces the
+    raw text when it matches the current clean_text code.
+    """
+    text = MODEL_TEXT if has_model_text(path, clean_text) else "text"
+    return [text, "category", "priority"]
+
+
+def prepare(df):
+    if MODEL_TEXT in df:
+        df["text_clean"] = df[MODEL_TEXT].fillna("").astype(str)
+    else:
+        df["text_clean"] = df["text"].astype(str).apply(clean_text)
+    df["category"] = df["category"].astype(str).str.strip().str.lower()
+    df["priority"] = df["priority"].astype(str).str.strip().str.lower()
+
+    return df
 
-X = vectorizer.fit_transform(df["text_clean"])
-pickle.dump(vectorizer, open(MODEL_DIR / "tfidf_vectorizer.pkl", "wb"))
+
+def load_data(path=DATA_PATH):
+    return prepare(read_dataset(path, training_columns(path)))
 
 
 # ==============================
-# CATEGORY MODEL (SVM)
+# TRAINING
 # ==============================
-Xc_train, Xc_test, yc_train, yc_test = train_test_split(
-    X,
-    y_category,
-    test_size=0.2,
-    stratify=y_category,
-    random_state=42
-)
+def fit_category(X, y, params=None):
+    """
+    LinearSVC on a stratified 80/20 split. Returns (model, y_test, y_pred).
+    """
+    X_train, X_test, y_train, y_test = train_test_split(
+        X,
+        y,
+        test_size=0.2,
+        stratify=y,
+        random_state=42
+    )
+
+    model = build_category_model(params)
+    model.fit(X_train, y_train)
+
+    return model, y_test, model.predict(X_test)
+
+
+def fit_priority(X, y, params=None):
+    """
+    LogisticRegression on a stratified 80/20 split. Returns
+    (model, y_test, y_pred).
+    """
+    X_train, X_test, y_train, y_test = train_test_split(
+        X,
+        y,
+        test_size=0.2,
+        stratify=y,
+        random_state=42
+    )
+
+    model = build_priority_model(params)
+    model.fit(X_train, y_train)
+
+    return model, y_test, model.predict(X_test)
+
+
+def train(df, mode="tfidf", verbose=True, params=None):
+    """
+    Fits the shared feature space plus category and priority models.
+    params defaults to load_params(mode). Returns (artifacts, metrics);
+    artifacts maps file name -> object.
+    """
+    params = params or load_params(mode)
 
-category_model = LinearSVC(class_weight="balanced")
-category_model.fit(Xc_train, yc_train)
+    # ---- LABEL ENCODING ----
+    category_encoder = LabelEncoder()
+    priority_encoder = LabelEncoder()
 
-yc_pred = category_model.predict(Xc_test)
+    y_category = category_encoder.fit_transform(df["category"])
+    y_priority = priority_encoder.fit_transform(df["priority"])
 
-print("\nCATEGORY RESULTS")
-print("Accuracy:", accuracy_score(yc_test, yc_pred))
-print(classification_report(yc_test, yc_pred, target_names=category_encoder.classes_))
+    # ---- FEATURES (ONE VECTOR SPACE) ----
+    vectorizer = build_vectorizer(mode, params["vectorizer"])
+    X = vectorizer.fit_transform(df["text_clean"])
 
-pickle.dump(category_model, open(MODEL_DIR / "category_model.pkl", "wb"))
+    # ---- CATEGORY MODEL (SVM) ----
+    category_model, yc_test, yc_pred = fit_category(
+        X, y_category, params["category"]
+    )
+
+    # ---- PRIORITY MODEL (LOGISTIC) ----
+    priority_model, yp_test, yp_pred = fit_priority(
+        X, y_priority, params["priority"]
+    )
+
+    if verbose:
+        print("\nCATEGORY RESULTS")
+        print("Accuracy:", accuracy_score(yc_test, yc_pred))
+        print(classification_report(
+            yc_test, yc_pred, target_names=category_encoder.classes_
+        ))
+
+        print("\nPRIORITY RESULTS")
+        print("Accuracy:", accuracy_score(yp_test, yp_pred))
+        print(classification_report(
+            yp_test, yp_pred, target_names=priority_encoder.classes_
+        ))
+
+    artifacts = {
+        VECTORIZER_FILES[mode]: vectorizer,
+        "category_model.pkl": category_model,
+        "priority_model.pkl": priority_model,
+        "category_encoder.pkl": category_encoder,
+        "priority_encoder.pkl": priority_encoder,
+    }
+    metrics = {
+        "category_accuracy": accuracy_score(yc_test, yc_pred),
+        "priority_accuracy": accuracy_score(yp_test, yp_pred),
+    }
+    return artifacts, metrics
 
 
 # ==============================
-# PRIORITY MODEL (LOGISTIC)
+# STREAMING (OUT-OF-CORE) TRAINING
 # ==============================
-Xp_train, Xp_test, yp_train, yp_test = train_test_split(
-    X,
-    y_priority,
-    test_size=0.2,
-    stratify=y_priority,
-    random_state=42
-)
+# Reads the dataset in chunks and never holds more than one chunk:
+#   pass 1   clean the text once, spilling train / held-out rows to
+#            temporary Parquet files; label counts (+ document
+#            frequencies for hashing features)
+#   pass 2+  partial_fit of SGD models on the train spill, one pass per
+#            epoch
+#   last     evaluation on the held-out spill
+# Every HOLDOUT_EVERY-th row is held out. Models are linear SGD
+# classifiers (hinge loss ~ LinearSVC, log loss ~ LogisticRegression)
+# with balanced class weights from pass 1, so the saved artifacts load
+# like the batch ones.
+STREAM_CHUNK_SIZE = 20_000
+STREAM_EPOCHS = 10
+HOLDOUT_EVERY = 5
 
-priority_model = LogisticRegression(
-    max_iter=1000,
-    class_weight="balanced",
-    n_jobs=-1
-)
 
-priority_model.fit(Xp_train, yp_train)
+def read_stream(path, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yields (chunk, is_holdout) with cleaned text and normalized labels.
+    """
+    offset = 0
+    columns = training_columns(path)
+    for chunk in iter_dataset(path, columns, chunk_size):
+        rows = np.arange(offset, offset + len(chunk))
+        is_holdout = rows % HOLDOUT_EVERY == 0
+        offset += len(chunk)
+        yield prepare(chunk), is_holdout
+
+
+def read_spill(spill, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yields the prepared chunks written to a spill file in pass 1.
+    """
+    if spill.rows:
+        yield from iter_dataset(spill.path, chunk_size=chunk_size)
+
 
-yp_pred = priority_model.predict(Xp_test)
+def _balanced_weights(counts, encoder):
+    """
+    sklearn's class_weight="balanced" from label counts.
+    """
+    total = sum(counts.values())
+    return np.array([
+        total / (len(counts) * counts[label]) for label in encoder.classes_
+    ])
+
+
+def train_streaming(path, mode="hashing", vectorizer=None,
+                    chunk_size=STREAM_CHUNK_SIZE, epochs=STREAM_EPOCHS,
+                    verbose=True):
+    """
+    Out-of-core counterpart of train(). For mode="tfidf" pass the
+    pre-fitted TfidfVectorizer; hashing features need no fitting beyond
+    the IDF vector collected in pass 1. Returns (artifacts, metrics).
+    """
+    if mode == "tfidf" and vectorizer is None:
+        raise ValueError(
+            "Streaming tfidf training needs a pre-fitted vectorizer"
+        )
+
+    with tempfile.TemporaryDirectory(prefix="stream_") as spill_dir:
+        return _train_streaming(
+            path, mode, vectorizer, chunk_size, epochs, verbose, spill_dir
+        )
+
+
+def _train_streaming(path, mode, vectorizer, chunk_size, epochs, verbose,
+                     spill_dir):
+    # ---- PASS 1: CLEAN + SPILL, LABELS (+ IDF) ----
+    category_counts, priority_counts = Counter(), Counter()
+    if mode == "hashing":
+        vectorizer = build_vectorizer("hashing")
+        hasher, tfidf = vectorizer.steps[0][1], vectorizer.steps[1][1]
+        doc_freq = np.zeros(HASHING_N_FEATURES)
+    n_docs = 0
+
+    spill_columns = ["text_clean", "category", "priority"]
+    train_spill = DatasetWriter(Path(spill_dir) / "train.parquet")
+    holdout_spill = DatasetWriter(Path(spill_dir) / "holdout.parquet")
+
+    with train_spill, holdout_spill:
+        for chunk, is_holdout in read_stream(path, chunk_size):
+            train_rows = chunk.loc[~is_holdout, spill_columns]
+            test_rows = chunk.loc[is_holdout, spill_columns]
+            if not train_rows.empty:
+                train_spill.write(train_rows)
+            if not test_rows.empty:
+                holdout_spill.write(test_rows)
+
+            category_counts.update(train_rows["category"])
+            priority_counts.update(train_rows["priority"])
+
+            if mode == "hashing":
+                counts = hasher.transform(train_rows["text_clean"])
+                doc_freq += np.bincount(
+                    counts.indices, minlength=HASHING_N_FEATURES
+                )
+                n_docs += len(train_rows)
+
+    if mode == "hashing":
+        # Same smoothing as TfidfTransformer(smooth_idf=True).fit
+        tfidf.idf_ = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+
+    category_encoder = LabelEncoder().fit(sorted(category_counts))
+    priority_encoder = LabelEncoder().fit(sorted(priority_counts))
+    category_weights = _balanced_weights(category_counts, category_encoder)
+    priority_weights = _balanced_weights(priority_counts, priority_encoder)
+
+    # ---- PASS 2+: INCREMENTAL FIT ----
+    category_model = SGDClassifier(loss="hinge", alpha=1e-5, random_state=42)
+    priority_model = SGDClassifier(loss="log_loss", alpha=1e-5, random_state=42)
+    category_classes = np.arange(len(category_encoder.classes_))
+    priority_classes = np.arange(len(priority_encoder.classes_))
+    rng = np.random.default_rng(42)
+
+    for epoch in range(epochs):
+        for train_rows in read_spill(train_spill, chunk_size):
+            train_rows = train_rows.iloc[rng.permutation(len(train_rows))]
+
+            X = vectorizer.transform(train_rows["text_clean"])
+            yc = category_encoder.transform(train_rows["category"])
+            yp = priority_encoder.transform(train_rows["priority"])
+
+            category_model.partial_fit(
+                X, yc, classes=category_classes,
+                sample_weight=category_weights[yc]
+            )
+            priority_model.partial_fit(
+                X, yp, classes=priority_classes,
+                sample_weight=priority_weights[yp]
+            )
+
+        if verbose:
+            print(f"Epoch {epoch + 1}/{epochs} done")
+
+    # ---- HELD-OUT EVALUATION ----
+    yc_test, yc_pred, yp_test, yp_pred = [], [], [], []
+
+    for test_rows in read_spill(holdout_spill, chunk_size):
+        # Labels never seen in training cannot be scored
+        test_rows = test_rows[
+            test_rows["category"].isin(category_counts)
+            & test_rows["priority"].isin(priority_counts)
+        ]
+        if test_rows.empty:
+            continue
+
+        X = vectorizer.transform(test_rows["text_clean"])
+        yc_test.extend(category_encoder.transform(test_rows["category"]))
+        yc_pred.extend(category_model.predict(X))
+        yp_test.extend(priority_encoder.transform(test_rows["priority"]))
+        yp_pred.extend(priority_model.predict(X))
+
+    if verbose:
+        print("\nCATEGORY RESULTS (held-out stream)")
+        print("Accuracy:", accuracy_score(yc_test, yc_pred))
+        print(classification_report(
+            yc_test, yc_pred,
+            labels=category_classes,
+            target_names=category_encoder.classes_,
+            zero_division=0
+        ))
+
+        print("\nPRIORITY RESULTS (held-out stream)")
+        print("Accuracy:", accuracy_score(yp_test, yp_pred))
+        print(classification_report(
+            yp_test, yp_pred,
+            labels=priority_classes,
+            target_names=priority_encoder.classes_,
+            zero_division=0
+        ))
+
+    artifacts = {
+        VECTORIZER_FILES[mode]: vectorizer,
+        "category_model.pkl": category_model,
+        "priority_model.pkl": priority_model,
+        "category_encoder.pkl": category_encoder,
+        "priority_encoder.pkl": priority_encoder,
+    }
+    metrics = {
+        "category_accuracy": accuracy_score(yc_test, yc_pred),
+        "priority_accuracy": accuracy_score(yp_test, yp_pred),
+    }
+    return artifacts, metrics
+
+
+# ==============================
+# LABEL SPACE GUARD
+# ==============================
+# The app's keyword rules (config/keyword_rules.json) and stored tickets
+# use the published encoders' labels. Datasets can use another label set
+# (e.g. data/cleaned/ and data/splits/), and publishing models trained on
+# one would silently relabel the app, so it has to be asked for.
+ENCODER_FILES = {
+    "category": "category_encoder.pkl",
+    "priority": "priority_encoder.pkl",
+}
+
+
+def label_changes(artifacts, model_dir):
+    """
+    {head: (published classes, new classes)} for each encoder in
+    artifacts whose classes differ from the one already in model_dir.
+    """
+    changes = {}
+    for head, name in ENCODER_FILES.items():
+        path = Path(model_dir) / name
+        if not path.exists():
+            continue
+        current = [str(c) for c in joblib.load(path).classes_]
+        new = [str(c) for c in artifacts[name].classes_]
+        if current != new:
+            changes[head] = (current, new)
+    return changes
+
+
+def check_label_space(artifacts, model_dir, allow_new_labels=False):
+    """
+    Raises RuntimeError if publishing to model_dir would change the
+    label space, unless allow_new_labels.
+    """
+    changes = label_changes(artifacts, model_dir)
+    if not changes or allow_new_labels:
+        return
+
+    lines = [f"Refusing to replace the models in {model_dir}: "
+             "the label space would change."]
+    for head, (current, new) in changes.items():
+        lines.append(f"  {head}: {', '.join(current)}")
+        lines.append(f"  {' ' * len(head)}  -> {', '.join(new)}")
+    lines.append("Train on data with the published labels, or pass "
+                 "--allow-new-labels (then update config/keyword_rules.json).")
+    raise RuntimeError("\n".join(lines))
+
+
+def save_artifacts(artifacts, out_dir):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    for name, obj in artifacts.items():
+        with open(out_dir / name, "wb") as f:
+            pickle.dump(obj, f)
+
+
+# ==============================
+# CLI
+# ==============================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train ticket models.")
+    parser.add_argument("--features", choices=FEATURE_MODES, default="tfidf")
+    parser.add_argument("--data", type=Path, default=DATA_PATH)
+    parser.add_argument(
+        "--model-dir",
+        type=Path,
+        help=f"default: {MODEL_DIR}, or {STREAMING_MODEL_DIR} with --streaming"
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=TRAINING_CONFIG_PATH,
+        help="hyperparameters (see tune_model.py)"
+    )
+    parser.add_argument(
+        "--allow-new-labels",
+        action="store_true",
+        help="publish even if the category/priority labels differ from "
+             "the models being replaced"
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="out-of-core training: read --data in chunks, SGD partial_fit"
+    )
+    parser.add_argument("--chunk-size", type=int, default=STREAM_CHUNK_SIZE)
+    parser.add_argument("--epochs", type=int, default=STREAM_EPOCHS)
+    parser.add_argument(
+        "--vectorizer",
+        type=Path,
+        default=MODEL_DIR / VECTORIZER_FILES["tfidf"],
+        help="pre-fitted TF-IDF vectorizer for --streaming --features tfidf"
+    )
+    args = parser.parse_args()
 
-print("\nPRIORITY RESULTS")
-print("Accuracy:", accuracy_score(yp_test, yp_pred))
-print(classification_report(yp_test, yp_pred, target_names=priority_encoder.classes_))
+    if args.streaming:
+        vectorizer = None
+        if args.features == "tfidf":
+            with open(args.vectorizer, "rb") as f:
+                vectorizer = pickle.load(f)
 
-pickle.dump(priority_model, open(MODEL_DIR / "priority_model.pkl", "wb"))
+        artifacts, _ = train_streaming(
+            args.data, args.features, vectorizer,
+            chunk_size=args.chunk_size, epochs=args.epochs
+        )
+    else:
+        df = load_data(args.data)
+        artifacts, _ = train(
+            df, args.features, params=load_params(args.features, args.config)
+        )
 
+    # SGD models never replace the served batch models unless asked to
+    model_dir = args.model_dir or (
+        STREAMING_MODEL_DIR if args.streaming else MODEL_DIR
+    )
+    out_dir = model_dir_for(args.features, model_dir)
+    try:
+        check_label_space(artifacts, out_dir, args.allow_new_labels)
+    except RuntimeError as e:
+        print(f"\n❌ {e}")
+        raise SystemExit(1)
+    save_artifacts(artifacts, out_dir)
 
-print("\n✅ Training completed successfully")
+    print(f"\n✅ Training completed successfully ({args.features} → {out_dir})")
+    if model_dir != MODEL_DIR:
+        print(f"Serve these models with TICKET_MODELS_DIR={model_dir} "
+              f"TICKET_FEATURE_MODE={args.features}")
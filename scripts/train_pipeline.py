@@ -0,0 +1,464 @@
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import sklearn
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.preprocessing import LabelEncoder
+
+import clean_text as clean_text_module
+import dataset_io
+from compact_models import stage_compact
+from dataset_io import find_dataset, read_dataset
+from train_model import (
+    BASE_DIR,
+    DATA_PATH,
+    FEATURE_MODES,
+    MODEL_DIR,
+    TRAINING_CONFIG_PATH,
+    VECTORIZER_FILES,
+    build_category_model,
+    build_priority_model,
+    build_vectorizer,
+    check_label_space,
+    fit_category,
+    fit_priority,
+    load_params,
+    model_dir_for,
+    prepare,
+    training_columns,
+)
+
+# ==============================
+# STAGED, CACHED TRAINING
+# ==============================
+#   load -> clean -> vectorize -> category -> priority -> evaluate -> publish
+#
+# Every stage's output is pickled under CACHE_DIR/<stage>/<key>.pkl. The
+# key hashes the stage's code, its parameters, the keys of the stages it
+# reads and the library versions; the load stage's key starts from the
+# dataset's SHA-256. A rerun only computes stages whose key changed, so
+# e.g. editing fit_priority() reuses the cleaned text, the vectorizer and
+# the category model.
+#
+# Both models are fitted on the one vectorize output and published
+# together with that vectorizer (publish checks the feature counts
+# match), so a model can no longer go live against a vocabulary it was
+# not trained on. training_manifest.json in the model dir records the
+# stage keys; when they match, publish is skipped too.
+#
+# Usage (from the scripts/ folder, like train_model.py):
+#   python train_pipeline.py --data ../data/splits/train.parquet
+#   python train_pipeline.py --features hashing --force
+
+CACHE_DIR = BASE_DIR / ".cache" / "training"
+KEEP_PER_STAGE = 3      # cached outputs kept per stage (least recently used go)
+MANIFEST_FILE = "training_manifest.json"
+COMPACT_DIRNAME = "compact"     # re-exported on publish when present (tfidf)
+
+# Part of every key: pickles and fitted estimators are not portable
+# across these
+ENVIRONMENT = {
+    "python": platform.python_version(),
+    "pandas": pd.__version__,
+    "sklearn": sklearn.__version__,
+}
+
+
+# ==============================
+# STAGES
+# ==============================
+def load_stage(path):
+    return read_dataset(path, training_columns(path))
+
+
+def clean_stage(df):
+    df = prepare(df.copy())
+    return df[["text_clean", "category", "priority"]]
+
+
+def vectorize_stage(df, mode, params):
+    vectorizer = build_vectorizer(mode, params)
+    X = vectorizer.fit_transform(df["text_clean"])
+    return {"vectorizer": vectorizer, "X": X}
+
+
+def _fit_head(df, features, head, fit, params):
+    encoder = LabelEncoder()
+    y = encoder.fit_transform(df[head])
+    model, y_test, y_pred = fit(features["X"], y, params)
+    return {
+        "model": model,
+        "encoder": encoder,
+        "y_test": y_test,
+        "y_pred": y_pred,
+    }
+
+
+def category_stage(df, features, params):
+    return _fit_head(df, features, "category", fit_category, params)
+
+
+def priority_stage(df, features, params):
+    return _fit_head(df, features, "priority", fit_priority, params)
+
+
+def evaluate_stage(category, priority):
+    results = {}
+    for head, fitted in (("category", category), ("priority", priority)):
+        results[f"{head}_accuracy"] = accuracy_score(
+            fitted["y_test"], fitted["y_pred"]
+        )
+        results[f"{head}_report"] = classification_report(
+            fitted["y_test"], fitted["y_pred"],
+            labels=range(len(fitted["encoder"].classes_)),
+            target_names=fitted["encoder"].classes_,
+            zero_division=0
+        )
+    return results
+
+
+# name -> (input stages, function, code hashed into the key)
+STAGES = {
+    "load": (
+        (), load_stage,
+        (load_stage, training_columns, dataset_io, clean_text_module)
+    ),
+    "clean": (("load",), clean_stage, (clean_stage, prepare, clean_text_module)),
+    "vectorize": (("clean",), vectorize_stage, (vectorize_stage, build_vectorizer)),
+    "category": (
+        ("clean", "vectorize"), category_stage,
+        (category_stage, _fit_head, fit_category, build_category_model)
+    ),
+    "priority": (
+        ("clean", "vectorize"), priority_stage,
+        (priority_stage, _fit_head, fit_priority, build_priority_model)
+    ),
+    "evaluate": (("category", "priority"), evaluate_stage, (evaluate_stage,)),
+}
+
+
+# ==============================
+# CONTENT ADDRESSING
+# ==============================
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_sha256(objects):
+    digest = hashlib.sha256()
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def stage_key(name, inputs, params):
+    _, _, code = STAGES[name]
+    payload = json.dumps({
+        "stage": name,
+        "code": code_sha256(code),
+        "inputs": inputs,
+        "params": params,
+        "env": ENVIRONMENT,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:20]
+
+
+class StageCache:
+    """
+    One pickle per (stage, key). Writes are atomic, so an interrupted
+    run never leaves a truncated entry behind.
+    """
+
+    def __init__(self, root=CACHE_DIR, keep=KEEP_PER_STAGE):
+        self.root = Path(root)
+        self.keep = keep
+
+    def _path(self, stage, key):
+        return self.root / stage / f"{key}.pkl"
+
+    def has(self, stage, key):
+        return self._path(stage, key).exists()
+
+    def load(self, stage, key):
+        path = self._path(stage, key)
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+        os.utime(path)      # mark as recently used for prune()
+        return value
+
+    def store(self, stage, key, value):
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_pickle(value, path)
+        self.prune(stage)
+
+    def prune(self, stage):
+        entries = sorted(
+            (self.root / stage).glob("*.pkl"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True
+        )
+        for path in entries[self.keep:]:
+            path.unlink(missing_ok=True)
+
+
+def _atomic_pickle(obj, path):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(obj, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+# ==============================
+# PIPELINE
+# ==============================
+class TrainingPipeline:
+    """
+    Computes every stage key up front (they depend only on code, params
+    and upstream keys), then loads or computes just the outputs that are
+    needed: nothing at all when the published manifest already matches.
+    """
+
+    def __init__(self, data_path=DATA_PATH, mode="tfidf", cache=None,
+                 force=False, verbose=True, config_path=TRAINING_CONFIG_PATH,
+                 allow_new_labels=False):
+        self.data_path = find_dataset(data_path)
+        self.mode = mode
+        self.cache = cache or StageCache()
+        self.force = force
+        self.verbose = verbose
+        self.allow_new_labels = allow_new_labels
+
+        hyper = load_params(mode, config_path)
+        self.params = {name: {} for name in STAGES}
+        self.params["vectorize"] = {"mode": mode, "params": hyper["vectorizer"]}
+        self.params["category"] = {"params": hyper["category"]}
+        self.params["priority"] = {"params": hyper["priority"]}
+
+        self.keys = {}
+        self.status = {}      # stage -> (cached|computed, seconds)
+        self._outputs = {}
+
+        data_sha = file_sha256(self.data_path)
+        for name, (deps, _, _) in STAGES.items():
+            inputs = [self.keys[d] for d in deps] or [data_sha]
+            self.keys[name] = stage_key(name, inputs, self.params[name])
+
+    def output(self, name):
+        if name in self._outputs:
+            return self._outputs[name]
+
+        deps, func, _ = STAGES[name]
+        key = self.keys[name]
+        start = time.perf_counter()
+
+        if not self.force and self.cache.has(name, key):
+            value = self.cache.load(name, key)
+            state = "cached"
+        else:
+            args = [self.output(d) for d in deps] or [self.data_path]
+            start = time.perf_counter()
+            value = func(*args, **self.params[name])
+            self.cache.store(name, key, value)
+            state = "computed"
+
+        self.status[name] = (state, time.perf_counter() - start)
+        if self.verbose:
+            print(f"  {name:<10} {state:<9} {self.status[name][1]:7.2f}s  {key}")
+
+        self._outputs[name] = value
+        return value
+
+    def artifacts(self):
+        """
+        Model dir file name -> object, all from this run's one feature space.
+        """
+        features = self.output("vectorize")
+        category = self.output("category")
+        priority = self.output("priority")
+
+        n_features = features["X"].shape[1]
+        for head, fitted in (("category", category), ("priority", priority)):
+            if fitted["model"].coef_.shape[1] != n_features:
+                raise RuntimeError(
+                    f"{head} model expects {fitted['model'].coef_.shape[1]} "
+                    f"features, the vectorizer produces {n_features}"
+                )
+
+        return {
+            VECTORIZER_FILES[self.mode]: features["vectorizer"],
+            "category_model.pkl": category["model"],
+            "priority_model.pkl": priority["model"],
+            "category_encoder.pkl": category["encoder"],
+            "priority_encoder.pkl": priority["encoder"],
+        }
+
+    def publish(self, model_dir):
+        """
+        Writes the artifacts and manifest to model_dir, plus a fresh
+        compact export if model_dir has one. Returns False when the
+        manifest there already records these stage keys; raises
+        RuntimeError if the label space would change (check_label_space).
+        """
+        model_dir = Path(model_dir)
+        manifest_path = model_dir / MANIFEST_FILE
+
+        if not self.force and manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text())
+            artifacts_exist = all(
+                (model_dir / name).exists() for name in (
+                    VECTORIZER_FILES[self.mode], "category_model.pkl",
+                    "priority_model.pkl", "category_encoder.pkl",
+                    "priority_encoder.pkl",
+                )
+            )
+            if manifest.get("keys") == self.keys and artifacts_exist:
+                return False
+
+        artifacts = self.artifacts()
+        check_label_space(artifacts, model_dir, self.allow_new_labels)
+        results = self.output("evaluate")
+
+        model_dir.mkdir(parents=True, exist_ok=True)
+        staged = []
+        for name, obj in artifacts.items():
+            fd, tmp = tempfile.mkstemp(dir=model_dir, prefix=f".{name}.")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(obj, f)
+                f.flush()
+                os.fsync(f.fileno())
+            staged.append((tmp, model_dir / name))
+
+        # The memory-mapped copy served with TICKET_MODEL_FORMAT=compact
+        compact_dir = model_dir / COMPACT_DIRNAME
+        export_dir = None
+        if self.mode == "tfidf" and compact_dir.is_dir():
+            try:
+                export_dir, files = stage_compact(
+                    artifacts[VECTORIZER_FILES["tfidf"]],
+                    artifacts["category_model.pkl"],
+                    artifacts["priority_model.pkl"],
+                    artifacts["category_encoder.pkl"],
+                    artifacts["priority_encoder.pkl"],
+                    compact_dir
+                )
+            except BaseException:
+                for tmp, _ in staged:
+                    os.unlink(tmp)
+                raise
+            staged.extend(files)
+
+        # Every file is fully written before any is swapped in
+        for tmp, target in staged:
+            os.replace(tmp, target)
+        if export_dir is not None:
+            shutil.rmtree(export_dir)
+
+        manifest = {
+            "data": str(self.data_path.resolve()),
+            "features": self.mode,
+            "keys": self.keys,
+            "category_accuracy": results["category_accuracy"],
+            "priority_accuracy": results["priority_accuracy"],
+            "published_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+        return True
+
+
+def run_pipeline(data_path=DATA_PATH, mode="tfidf", model_dir=MODEL_DIR,
+                 cache_dir=CACHE_DIR, force=False, publish=True, verbose=True,
+                 config_path=TRAINING_CONFIG_PATH, allow_new_labels=False):
+    """
+    Returns (pipeline, published); model_dir is the root models folder.
+    """
+    pipeline = TrainingPipeline(
+        data_path, mode, StageCache(cache_dir), force=force, verbose=verbose,
+        config_path=config_path, allow_new_labels=allow_new_labels
+    )
+    out_dir = model_dir_for(mode, model_dir)
+
+    published = False
+    if publish:
+        published = pipeline.publish(out_dir)
+    else:
+        pipeline.output("evaluate")
+
+    return pipeline, published
+
+
+# ==============================
+# CLI
+# ==============================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Train ticket models with cached pipeline stages."
+    )
+    parser.add_argument("--features", choices=FEATURE_MODES, default="tfidf")
+    parser.add_argument("--data", type=Path, default=DATA_PATH)
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument(
+        "--config", type=Path, default=TRAINING_CONFIG_PATH,
+        help="hyperparameters (see tune_model.py)"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="recompute every stage and republish"
+    )
+    parser.add_argument(
+        "--no-publish", action="store_true",
+        help="run through evaluate without touching the model dir"
+    )
+    parser.add_argument(
+        "--allow-new-labels", action="store_true",
+        help="publish even if the labels differ from the published models"
+    )
+    args = parser.parse_args()
+
+    try:
+        pipeline, published = run_pipeline(
+            args.data, args.features, args.model_dir, args.cache_dir,
+            force=args.force, publish=not args.no_publish,
+            config_path=args.config, allow_new_labels=args.allow_new_labels
+        )
+    except RuntimeError as e:
+        print(f"\n❌ {e}")
+        raise SystemExit(1)
+
+    if "evaluate" in pipeline.status:
+        results = pipeline.output("evaluate")
+        for head in ("category", "priority"):
+            print(f"\n{head.upper()} RESULTS")
+            print("Accuracy:", results[f"{head}_accuracy"])
+            print(results[f"{head}_report"])
+
+    out_dir = model_dir_for(args.features, args.model_dir)
+    if published:
+        print(f"\n✅ Published {args.features} models → {out_dir}")
+    elif args.no_publish:
+        print("\n⏭ Not published (--no-publish)")
+    else:
+        print(f"\n⏭ {out_dir} is already up to date")
@@ -0,0 +1,290 @@
+import argparse
+import itertools
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import LabelEncoder
+
+from dataset_io import find_dataset
+from train_model import (
+    BASE_DIR,
+    DEFAULT_PARAMS,
+    FEATURE_MODES,
+    TRAINING_CONFIG_PATH,
+    build_category_model,
+    build_priority_model,
+    build_vectorizer,
+    load_data,
+)
+
+# ==============================
+# CROSS-VALIDATED HYPERPARAMETER SEARCH
+# ==============================
+# Grid search over vectorizer and model parameters with stratified
+# k-fold CV (folds stratified on category), in a process pool:
+#   phase 1  one task per (vectorizer candidate, fold): fit the
+#            vectorizer on the fold's train part, save both matrices
+#   phase 2  one task per (vectorizer candidate, fold, head): load the
+#            cached matrices once, score every model candidate
+# Both heads must share one vectorizer, so the winner is the vectorizer
+# candidate with the best summed category + priority CV score, each
+# head with its best model parameters under it. The result is written
+# to config/training.json, which train_model.py and train_pipeline.py
+# read.
+#
+# Tunes on the train split by default: the full cleaned dataset also
+# holds make_splits.py's test rows, which must not pick hyperparameters.
+#
+# Usage (from the scripts/ folder, like train_model.py):
+#   python tune_model.py
+#   python tune_model.py --data ../data/splits/train.csv --folds 3 --dry-run
+
+GRIDS = {
+    "tfidf": {
+        "vectorizer": {
+            "max_features": [20000, 30000, 50000],
+            "ngram_range": [[1, 1], [1, 2]],
+            "min_df": [1, 2],
+            "sublinear_tf": [True],
+        },
+        "category": {"C": [0.1, 0.3, 1.0, 3.0, 10.0]},
+        "priority": {"C": [0.3, 1.0, 3.0, 10.0, 30.0]},
+    },
+    "hashing": {
+        "vectorizer": {
+            "ngram_range": [[1, 1], [1, 2]],
+            "sublinear_tf": [True, False],
+        },
+        "category": {"C": [0.1, 0.3, 1.0, 3.0, 10.0]},
+        "priority": {"C": [0.3, 1.0, 3.0, 10.0, 30.0]},
+    },
+}
+
+MODEL_BUILDERS = {
+    "category": build_category_model,
+    "priority": build_priority_model,
+}
+SCORERS = {
+    "accuracy": accuracy_score,
+    "f1_macro": lambda y, p: f1_score(y, p, average="macro"),
+}
+N_FOLDS = 5
+# Parquet, or the same stem in another format (find_dataset)
+TRAIN_SPLIT = BASE_DIR / "data" / "splits" / "train.parquet"
+
+
+def candidates(grid):
+    """
+    Every combination of a {param: [values]} grid, as dicts.
+    """
+    names = sorted(grid)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(grid[n] for n in names))
+    ]
+
+
+# ==============================
+# WORKERS
+# ==============================
+_texts = None
+
+
+def _init_worker(texts):
+    global _texts
+    _texts = texts
+
+
+def _vectorize_fold(mode, vec_params, train_idx, val_idx, out_path):
+    vectorizer = build_vectorizer(mode, vec_params)
+    X_train = vectorizer.fit_transform(_texts[train_idx])
+    X_val = vectorizer.transform(_texts[val_idx])
+
+    sparse.save_npz(f"{out_path}.train.npz", X_train.tocsr())
+    sparse.save_npz(f"{out_path}.val.npz", X_val.tocsr())
+    return out_path
+
+
+@lru_cache(maxsize=4)
+def _load_fold(path):
+    return (
+        sparse.load_npz(f"{path}.train.npz"),
+        sparse.load_npz(f"{path}.val.npz"),
+    )
+
+
+def _score_head(path, head, model_grid, y_train, y_val, scoring):
+    X_train, X_val = _load_fold(path)
+    scores = []
+    for params in model_grid:
+        model = MODEL_BUILDERS[head](params)
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=1)     # the pool already uses every core
+        model.fit(X_train, y_train)
+        scores.append(SCORERS[scoring](y_val, model.predict(X_val)))
+    return scores
+
+
+# ==============================
+# SEARCH
+# ==============================
+def tune(df, mode="tfidf", folds=N_FOLDS, scoring="accuracy", workers=None,
+         verbose=True):
+    """
+    Returns the best {"vectorizer", "category", "priority"} params plus
+    a summary of the CV scores.
+    """
+    grid = GRIDS[mode]
+    vec_grid = candidates(grid["vectorizer"])
+    model_grids = {head: candidates(grid[head]) for head in MODEL_BUILDERS}
+
+    texts = df["text_clean"].to_numpy()
+    labels = {
+        head: LabelEncoder().fit_transform(df[head]) for head in MODEL_BUILDERS
+    }
+    splits = list(StratifiedKFold(
+        n_splits=folds, shuffle=True, random_state=42
+    ).split(texts, labels["category"]))
+
+    workers = workers or os.cpu_count()
+    # scores[head][v] -> (folds x model candidates)
+    scores = {
+        head: np.zeros((len(vec_grid), folds, len(model_grids[head])))
+        for head in MODEL_BUILDERS
+    }
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="tune_") as cache_dir, \
+            ProcessPoolExecutor(
+                workers, initializer=_init_worker, initargs=(texts,)
+            ) as pool:
+
+        # ---- PHASE 1: ONE VECTORIZER FIT PER (CANDIDATE, FOLD) ----
+        fold_paths = {}
+        futures = {
+            pool.submit(
+                _vectorize_fold, mode, vec_params, train_idx, val_idx,
+                os.path.join(cache_dir, f"v{v}_f{f}")
+            ): (v, f)
+            for v, vec_params in enumerate(vec_grid)
+            for f, (train_idx, val_idx) in enumerate(splits)
+        }
+        for future, vf in futures.items():
+            fold_paths[vf] = future.result()
+
+        if verbose:
+            print(f"Vectorized {len(vec_grid)} candidates x {folds} folds "
+                  f"in {time.perf_counter() - start:.1f}s")
+
+        # ---- PHASE 2: MODEL CANDIDATES ON THE CACHED MATRICES ----
+        futures = {
+            pool.submit(
+                _score_head, fold_paths[v, f], head, model_grids[head],
+                labels[head][train_idx], labels[head][val_idx], scoring
+            ): (head, v, f)
+            for v in range(len(vec_grid))
+            for f, (train_idx, val_idx) in enumerate(splits)
+            for head in MODEL_BUILDERS
+        }
+        for future, (head, v, f) in futures.items():
+            scores[head][v, f] = future.result()
+
+    # ---- SELECTION (ONE SHARED VECTORIZER) ----
+    mean = {head: s.mean(axis=1) for head, s in scores.items()}
+    best_model = {head: m.argmax(axis=1) for head, m in mean.items()}
+    combined = sum(m.max(axis=1) for m in mean.values())
+    v_best = int(combined.argmax())
+
+    best = {"vectorizer": vec_grid[v_best]}
+    summary = {
+        "features": mode,
+        "folds": folds,
+        "scoring": scoring,
+        "candidates": len(vec_grid) * sum(map(len, model_grids.values())),
+        "seconds": round(time.perf_counter() - start, 1),
+    }
+    for head in MODEL_BUILDERS:
+        m = int(best_model[head][v_best])
+        best[head] = model_grids[head][m]
+        summary[f"{head}_cv_mean"] = float(mean[head][v_best, m])
+        summary[f"{head}_cv_std"] = float(scores[head][v_best, :, m].std())
+
+    if verbose:
+        width = max(len(json.dumps(p)) for p in vec_grid) + 2
+        print(f"\n{'vectorizer':<{width}}{'category':>10}{'priority':>10}")
+        for v in np.argsort(-combined):
+            print(f"{json.dumps(vec_grid[v]):<{width}}"
+                  f"{mean['category'][v].max():>10.4f}"
+                  f"{mean['priority'][v].max():>10.4f}")
+
+    return best, summary
+
+
+def write_config(best, summary, path=TRAINING_CONFIG_PATH):
+    """
+    Stores the mode's section; other modes' sections are kept.
+    """
+    path = Path(path)
+    config = json.loads(path.read_text()) if path.exists() else {}
+    config[summary["features"]] = {
+        **best,
+        "tuning": {
+            **summary,
+            "tuned_at": datetime.now().isoformat(timespec="seconds"),
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(config, indent=2) + "\n")
+
+
+# ==============================
+# CLI
+# ==============================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Cross-validated hyperparameter search."
+    )
+    parser.add_argument("--features", choices=FEATURE_MODES, default="tfidf")
+    parser.add_argument(
+        "--data", type=Path, default=TRAIN_SPLIT,
+        help="training data only; default: the train split"
+    )
+    parser.add_argument("--folds", type=int, default=N_FOLDS)
+    parser.add_argument("--scoring", choices=sorted(SCORERS), default="accuracy")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="default: all cores"
+    )
+    parser.add_argument("--config", type=Path, default=TRAINING_CONFIG_PATH)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="print, don't write the config"
+    )
+    args = parser.parse_args()
+
+    data_path = find_dataset(args.data)
+    print(f"Tuning on {data_path}")
+    df = load_data(data_path)
+    best, summary = tune(
+        df, args.features, args.folds, args.scoring, args.workers
+    )
+
+    print("\nBest configuration:")
+    for part in DEFAULT_PARAMS[args.features]:
+        print(f"  {part:<11} {best[part]}")
+    print(f"  category CV {args.scoring}: {summary['category_cv_mean']:.4f} "
+          f"± {summary['category_cv_std']:.4f}")
+    print(f"  priority CV {args.scoring}: {summary['priority_cv_mean']:.4f} "
+          f"± {summary['priority_cv_std']:.4f}")
+
+    if not args.dry_run:
+        write_config(best, summary, args.config)
+        print(f"\n✅ Saved to {args.config}; train_model.py will use it")